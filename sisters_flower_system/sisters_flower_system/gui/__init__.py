@@ -9,7 +9,9 @@ from .base_components import (
     BaseWindow,
     BaseButton,
     BaseEntry,
-    BaseLabel
+    BaseLabel,
+    EventBus,
+    event_bus
 )
 
 from .table_components import (
@@ -23,5 +25,7 @@ __all__ = [
     'BaseButton',
     'BaseEntry',
     'BaseLabel',
+    'EventBus',
+    'event_bus',
     'SortableTable'
 ]
\ No newline at end of file
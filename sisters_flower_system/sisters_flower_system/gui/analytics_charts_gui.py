@@ -3,7 +3,9 @@
 提供完整的数据分析和图表展示功能
 """
 
+import asyncio
 import os
+import queue
 import threading
 import time
 import tkinter as tk
@@ -35,9 +37,9 @@ from matplotlib.figure import Figure
 #     from services.member_service import MemberService
 
 try:
-    from .base_components import BaseFrame, BaseLabel, BaseButton, BaseTreeview
+    from .base_components import BaseFrame, BaseLabel, BaseButton, BaseTreeview, event_bus
 except ImportError:
-    from base_components import BaseFrame, BaseLabel, BaseButton, BaseTreeview
+    from base_components import BaseFrame, BaseLabel, BaseButton, BaseTreeview, event_bus
 
 
 class ChartManager:
@@ -645,7 +647,7 @@ class AnalyticsChartsGUI(BaseFrame):
                         time.sleep(interval)
                     else:
                         time.sleep(1)
-                except:
+                except (tk.TclError, ValueError):
                     time.sleep(1)
         
         if self.auto_refresh:
@@ -734,10 +736,27 @@ class ChartWindow:
 class DataAnalyticsPanel(BaseFrame):
     """数据分析面板"""
     
+    REFRESH_INTERVAL = 5  # 秒
+    MAX_REFRESH_BACKOFF = 60  # 后端出错时的最大重试间隔（秒）
+    # 主线程检查数据快照队列的间隔（毫秒），与刷新周期一致，避免频繁的Tcl定时器
+    POLL_INTERVAL = REFRESH_INTERVAL * 1000
+    
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
         self.chart_manager = ChartManager()
+        # 数据写入时由事件总线置脏，刷新协程仅在脏时重新计算
+        self._cache_dirty = False
+        self._refresh_loop = None
+        self._refresh_thread = None
+        self._refresh_task = None
+        self._wake_event = None
+        # 刷新协程把数据快照放入队列，由主线程轮询取出后更新界面
+        self._snapshots = queue.Queue()
+        self._poll_after_id = None
+        for topic in ('sales_changed', 'inventory_changed', 'customers_changed'):
+            event_bus.subscribe(topic, self._on_data_changed)
         self.setup_ui()
+        self._start_realtime_refresher()
         
     def setup_ui(self):
         """设置用户界面"""
@@ -783,17 +802,127 @@ class DataAnalyticsPanel(BaseFrame):
         analytics_gui.update_chart()
         analytics_gui.pack(fill='both', expand=True)
         
+    def _on_data_changed(self, *args, **kwargs):
+        """后台数据变更回调"""
+        self._cache_dirty = True
+        # 唤醒刷新协程立即处理，无需等待下一个刷新周期
+        if self._refresh_loop and self._wake_event:
+            self._refresh_loop.call_soon_threadsafe(self._wake_event.set)
+    
+    def _start_realtime_refresher(self):
+        """在独立线程的asyncio事件循环中启动实时刷新协程"""
+        if self._refresh_loop:
+            return
+        loop = self._refresh_loop = asyncio.new_event_loop()
+        # 线程启动前创建任务，停止时总能取消到它
+        self._refresh_task = loop.create_task(self._realtime_refresher())
+        self._refresh_thread = threading.Thread(
+            target=self._run_refresher, args=(loop, self._refresh_task), daemon=True
+        )
+        self._refresh_thread.start()
+        self._poll_after_id = self.widget.after(self.POLL_INTERVAL, self._drain_snapshots)
+    
+    @staticmethod
+    def _run_refresher(loop, task):
+        """刷新线程入口：运行事件循环直到刷新协程结束或被取消"""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+    
+    def stop_realtime_refresher(self):
+        """停止实时刷新协程并回收事件循环"""
+        if self._poll_after_id:
+            self.widget.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
+        loop = self._refresh_loop
+        if not loop:
+            return
+        loop.call_soon_threadsafe(self._refresh_task.cancel)
+        # 正在执行的数据获取不会被中断，最多等待一个刷新周期
+        self._refresh_thread.join(timeout=self.REFRESH_INTERVAL)
+        if self._refresh_thread.is_alive():
+            print("实时刷新线程未能及时结束")
+        else:
+            loop.close()
+        self._refresh_loop = None
+        self._refresh_thread = None
+        self._refresh_task = None
+        self._wake_event = None
+    
+    def _drain_snapshots(self):
+        """主线程定时取出队列中的数据快照，只渲染最新的一份"""
+        self._poll_after_id = None
+        snapshot = None
+        try:
+            while True:
+                snapshot = self._snapshots.get_nowait()
+        except queue.Empty:
+            pass
+        if snapshot is not None:
+            self._apply_realtime_snapshot(snapshot)
+        if self._refresh_loop:
+            self._poll_after_id = self.widget.after(self.POLL_INTERVAL, self._drain_snapshots)
+    
+    async def _realtime_refresher(self):
+        """实时刷新协程：后台获取数据，界面更新由主线程从队列中取出后完成"""
+        loop = asyncio.get_running_loop()
+        self._wake_event = asyncio.Event()
+        delay = self.REFRESH_INTERVAL
+        
+        while True:
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+            
+            if not self._cache_dirty:
+                continue
+            self._cache_dirty = False
+            
+            try:
+                snapshot = await loop.run_in_executor(None, self._fetch_realtime_snapshot)
+            except Exception as e:
+                print(f"获取实时数据失败: {e}")
+                # 后端出错时指数退避重试
+                self._cache_dirty = True
+                delay = min(delay * 2, self.MAX_REFRESH_BACKOFF)
+                continue
+            delay = self.REFRESH_INTERVAL
+            
+            # 不在此线程调用Tk，交由主线程轮询处理
+            self._snapshots.put(snapshot)
+    
     def update_realtime_data(self):
-        """更新实时数据"""
+        """立即更新实时数据"""
+        self._cache_dirty = False
+        try:
+            snapshot = self._fetch_realtime_snapshot()
+        except Exception as e:
+            print(f"更新实时数据失败: {e}")
+            return
+        self._apply_realtime_snapshot(snapshot)
+    
+    def _fetch_realtime_snapshot(self) -> Dict[str, Any]:
+        """获取实时数据快照（可在工作线程中执行）"""
+        return {
+            'sales': self.chart_manager.get_sales_data(7),
+            'inventory': self.chart_manager.get_inventory_data(),
+            'customer': self.chart_manager.get_customer_data()
+        }
+    
+    def _apply_realtime_snapshot(self, snapshot: Dict[str, Any]):
+        """将实时数据快照渲染到界面（必须在主线程中执行）"""
         try:
             # 清除旧数据
             for widget in self.data_frame.winfo_children():
                 widget.destroy()
             
-            # 获取数据
-            sales_data = self.chart_manager.get_sales_data(7)
-            inventory_data = self.chart_manager.get_inventory_data()
-            customer_data = self.chart_manager.get_customer_data()
+            sales_data = snapshot['sales']
+            inventory_data = snapshot['inventory']
+            customer_data = snapshot['customer']
             
             # 今日销售
             today_frame = ttk.LabelFrame(self.data_frame, text="今日销售概况", padding=10)
@@ -824,13 +953,13 @@ class DataAnalyticsPanel(BaseFrame):
             
         except Exception as e:
             print(f"更新实时数据失败: {e}")
-        
-        # 5秒后再次更新
-        if hasattr(self, 'widget') and self.widget:
-            try:
-                self.widget.after(5000, self.update_realtime_data)
-            except:
-                pass  # 如果widget不存在则跳过
+    
+    def destroy(self):
+        """销毁面板"""
+        self.stop_realtime_refresher()
+        for topic in ('sales_changed', 'inventory_changed', 'customers_changed'):
+            event_bus.unsubscribe(topic, self._on_data_changed)
+        super().destroy()
 
 
 def create_analytics_demo():
@@ -6,21 +6,30 @@
 import tkinter as tk
 from abc import ABC, abstractmethod
 from tkinter import ttk
+from types import MappingProxyType
 from typing import Any, Callable, Dict, List
 
 try:
     from ..config.settings import SCALE_FACTOR
+    # 事件总线定义在工具层，业务服务无需导入界面模块；此处继续导出以兼容界面代码
+    from ..utils.event_bus import EventBus, event_bus
 except ImportError:
-    # 直接从settings模块导入
-    import sys
+    # 非包方式运行时，将包根目录加入搜索路径（仅添加一次）
     import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import sys
+    _PKG_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _PKG_ROOT not in sys.path:
+        sys.path.insert(0, _PKG_ROOT)
     from config.settings import SCALE_FACTOR
+    from utils.event_bus import EventBus, event_bus
 
 
 class BaseComponent(ABC):
     """所有GUI组件的基类"""
     
+    # 各控件类型支持的配置选项缓存
+    _VALID_ATTRS: Dict[type, frozenset] = {}
+    
     def __init__(self, parent: tk.Widget, **kwargs):
         self.parent = parent
         self.widget = None
@@ -41,6 +50,8 @@ class BaseComponent(ABC):
             self._apply_config()
             self._apply_style()
             self._bind_events()
+            # 初始化完成后样式配置只读，修改需显式替换
+            self._style_config = MappingProxyType(self._style_config)
             self._is_initialized = True
     
     def _apply_config(self):
@@ -59,14 +70,32 @@ class BaseComponent(ABC):
     
     def _apply_style(self):
         """应用样式配置"""
-        if self.widget and self._style_config:
-            # 应用样式配置
+        if self.widget and self._style_config and hasattr(self.widget, 'configure'):
+            # 先按控件类型过滤无效选项，再一次性应用样式配置
+            valid_attrs = self._get_valid_attrs()
+            style = {}
             for key, value in self._style_config.items():
+                if valid_attrs is None or key in valid_attrs:
+                    style[key] = value
+                else:
+                    print(f"应用样式失败 {key}: 不支持的选项")
+            if style:
                 try:
-                    if hasattr(self.widget, 'configure'):
-                        self.widget.configure(**{key: value})
+                    self.widget.configure(**style)
                 except Exception as e:
-                    print(f"应用样式失败 {key}: {e}")
+                    print(f"应用样式失败 {', '.join(style)}: {e}")
+    
+    def _get_valid_attrs(self):
+        """获取控件支持的配置选项（按控件类型缓存）"""
+        widget_type = type(self.widget)
+        valid_attrs = self._VALID_ATTRS.get(widget_type)
+        if valid_attrs is None:
+            try:
+                valid_attrs = frozenset(self.widget.keys())
+            except Exception:
+                return None
+            self._VALID_ATTRS[widget_type] = valid_attrs
+        return valid_attrs
     
     def _bind_events(self):
         """绑定事件处理程序"""
@@ -138,15 +167,16 @@ class BaseWindow(BaseComponent):
     def __init__(self, title: str = "", **kwargs):
         self.title = title
         super().__init__(None, **kwargs)
-        self.root = tk.Tk()
-        self.root.title(title)
+        root = self.root = tk.Tk()
+        root.title(title)
         
         # 设置窗口属性
-        if 'width' in kwargs:
-            self.root.geometry(f"{kwargs['width']}x{kwargs.get('height', 400)}")
+        width = kwargs.get('width')
+        if width is not None:
+            root.geometry(f"{width}x{kwargs.get('height', 400)}")
         
         # 绑定关闭事件
-        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        root.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def create_widget(self):
         # BaseWindow不使用父组件，直接使用root
@@ -314,9 +344,10 @@ class BaseDialog(BaseWindow):
         super().__init__(title, **kwargs)
         
         # 设置对话框属性
-        self.root.transient(parent)
-        self.root.grab_set()  # 模态对话框
-        self.root.resizable(False, False)
+        root = self.root
+        root.transient(parent)
+        root.grab_set()  # 模态对话框
+        root.resizable(False, False)
     
     def show(self) -> Any:
         """显示对话框并返回结果"""
@@ -4,15 +4,25 @@
 """
 
 import calendar
+import functools
+import importlib.util
 import json
+import math
+import os
 import sqlite3
+import threading
 import tkinter as tk
-from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta
+from operator import itemgetter
 from tkinter import ttk, messagebox, filedialog
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
 
 # 导入现有组件
-from .base_components import BaseFrame
+from .base_components import BaseFrame, event_bus
 from .table_components import SortableTable
 
 # 导入主题系统
@@ -25,162 +35,512 @@ except ImportError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from config.win11_theme import win11_theme
 
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    from matplotlib.figure import Figure
-    import matplotlib.dates as mdates
-    import pandas as pd
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
+# pandas 导入较慢且占用内存，启动时只检测是否可用，首次使用时再导入
+HAS_PANDAS = importlib.util.find_spec('pandas') is not None
+
+# matplotlib 同样延迟到第一个图表显示时再导入；图表数据使用pandas汇总
+HAS_MATPLOTLIB = HAS_PANDAS and importlib.util.find_spec('matplotlib') is not None
+
+
+def _pandas():
+    """延迟导入pandas"""
+    import pandas
+    return pandas
+
+
+# 查询语句（固定文本，可命中连接的预编译语句缓存）
+SQL_INCOME_DETAIL = """
+SELECT
+    s.id,
+    s.sale_date,
+    s.total_amount,
+    s.discount_amount,
+    s.final_amount,
+    s.payment_method,
+    s.notes,
+    COUNT(si.id) as item_count
+FROM sales s
+LEFT JOIN sale_items si ON s.id = si.sale_id
+WHERE s.sale_date >= ? AND s.sale_date < ?
+GROUP BY s.id
+ORDER BY s.sale_date DESC
+"""
+
+SQL_EXPENSE_DETAIL = """
+SELECT
+    id,
+    expense_date,
+    category,
+    amount,
+    description,
+    payment_method
+FROM expenses
+WHERE expense_date >= ? AND expense_date < ?
+ORDER BY expense_date DESC
+"""
+
+SQL_INCOME_MONTHLY = """
+SELECT
+    strftime('%Y-%m', sale_date) AS month,
+    COALESCE(SUM(final_amount), 0),
+    COUNT(*)
+FROM sales
+WHERE sale_date >= ? AND sale_date < ?
+GROUP BY month
+"""
+
+SQL_EXPENSE_MONTHLY = """
+SELECT
+    strftime('%Y-%m', expense_date) AS month,
+    COALESCE(SUM(amount), 0),
+    COUNT(*)
+FROM expenses
+WHERE expense_date >= ? AND expense_date < ?
+GROUP BY month
+"""
+
+SQL_INCOME_TOTALS = """
+SELECT
+    COALESCE(SUM(final_amount), 0),
+    COUNT(*),
+    COALESCE(AVG(final_amount), 0)
+FROM sales
+WHERE sale_date >= ? AND sale_date < ?
+"""
+
+SQL_EXPENSE_TOTALS = """
+SELECT
+    COALESCE(SUM(amount), 0),
+    COUNT(*),
+    COALESCE(AVG(amount), 0)
+FROM expenses
+WHERE expense_date >= ? AND expense_date < ?
+"""
+
+# 金额/百分比格式化模板
+_FMT_YUAN = "¥{:,.2f}".format
+_FMT_PCT = "{:.1f}%".format
+
+# 导出Excel时的表头（与明细查询的列顺序一致）
+INCOME_EXPORT_HEADERS = ('订单ID', '日期', '原价', '折扣', '实收金额', '支付方式', '备注', '商品数量')
+EXPENSE_EXPORT_HEADERS = ('编号', '日期', '类别', '金额', '描述', '支付方式')
+
+# 财务摘要固定部分模板（按分支变化的内容在其后追加）
+_SUMMARY_TEMPLATE = """
+# 财务摘要报告
+
+## 总体情况
+- **报告期间**: {start} 至 {end}
+- **总收入**: {total_income}
+- **总支出**: {total_expense}
+- **净利润**: {net_profit}
+- **利润率**: {profit_margin}
+
+## 经营分析
+- **收入笔数**: {order_count}笔
+- **支出笔数**: {expense_count}笔
+- **收支比**: {ratio_line}
+
+## 盈利能力评估
+"""
+
+
+def _date_bounds(start_date: str, end_date: str) -> tuple:
+    """将日期范围转换为半开区间 [开始, 结束次日)
+    
+    'YYYY-MM' 形式的月份按整月处理。WHERE 条件中不对列套用函数，
+    以便 idx_sales_date / idx_expenses_date 索引可以直接服务范围扫描。
+    """
+    if len(start_date) == 7:
+        start_date = f"{start_date}-01"
+    
+    if len(end_date) == 7:
+        year, month = map(int, end_date.split('-'))
+        upper = date(year + month // 12, month % 12 + 1, 1)
+    else:
+        upper = datetime.strptime(end_date[:10], '%Y-%m-%d').date() + timedelta(days=1)
+    
+    return start_date, upper.strftime('%Y-%m-%d')
+
+
+@functools.lru_cache(maxsize=256)
+def _month_last_day(year: int, month: int) -> int:
+    """获取某月最后一天（结果缓存）"""
+    return calendar.monthrange(year, month)[1]
+
+
+# 月份 -> 所在季度的 (起始月, 结束月)
+_QUARTERS = {month: ((month - 1) // 3 * 3 + 1, (month - 1) // 3 * 3 + 3) for month in range(1, 13)}
+
+
+def _cached_query(method):
+    """按 (方法名, 开始日期, 结束日期) 缓存查询结果，超出容量时淘汰最久未使用的条目"""
+    @functools.wraps(method)
+    def wrapper(self, start_date, end_date):
+        key = (method.__name__, start_date, end_date)
+        # 查询可能在后台线程执行，缓存读写与查询串行化
+        with self._lock:
+            self.check_data_version()
+            cache = self._cache
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+            
+            result = method(self, start_date, end_date)
+            cache[key] = result
+            if len(cache) > self.CACHE_SIZE:
+                cache.popitem(last=False)
+            return result
+    return wrapper
 
 
 class FinancialDataManager:
     """财务报表数据管理器"""
     
+    # 查询结果缓存容量（按日期范围计）
+    CACHE_SIZE = 32
+    
     def __init__(self, db_path: str = None):
         self.db_path = db_path or "sisters_flowers.db"
+        # 缓存结果为只读共享对象，调用方不应修改
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+        # 缓存代数：每次清空缓存加一，界面据此判断手头的数据是否过期
+        self.generation = 0
+        self._data_version = None
+        
+        # 整个管理器复用同一个连接，避免每次查询重新打开数据库；
+        # 连接会被主线程和后台线程共用，所有对 _conn 的调用都在 _lock 内进行
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        for pragma in (
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA cache_size=-20000"
+        ):
+            try:
+                self._conn.execute(pragma)
+            except sqlite3.Error as e:
+                print(f"设置数据库参数失败: {e}")
+        
+        self._ensure_indexes()
+        
+        # 销售数据变更时清空缓存；支出没有对应的事件，由 check_data_version 发现
+        event_bus.subscribe('sales_changed', self.clear_cache)
     
-    def get_income_data(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-        """获取收入数据"""
+    def clear_cache(self, *args):
+        """清空查询结果缓存"""
+        with self._lock:
+            self._cache.clear()
+            self.generation += 1
+    
+    def check_data_version(self):
+        """其他连接提交过写入（如录入支出）时清空缓存
+        
+        PRAGMA data_version 只在其他连接修改数据库后变化，查询代价很小。
+        """
+        with self._lock:
+            try:
+                version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            except sqlite3.Error as e:
+                print(f"检查数据版本失败: {e}")
+                return
+            if version != self._data_version:
+                if self._data_version is not None:
+                    self.clear_cache()
+                self._data_version = version
+    
+    def _ensure_indexes(self):
+        """确保日期列上存在索引，使日期范围查询走索引扫描"""
+        for sql in (
+            "CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(sale_date)",
+            "CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(expense_date)"
+        ):
+            try:
+                self._conn.execute(sql)
+            except sqlite3.Error as e:
+                print(f"创建索引失败: {e}")
+        self._conn.commit()
+    
+    def close(self):
+        """关闭数据库连接"""
+        event_bus.unsubscribe('sales_changed', self.clear_cache)
+        with self._lock:
+            self._cache.clear()
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+    
+    def _select_income(self, start_date: str, end_date: str) -> sqlite3.Cursor:
+        """执行收入明细查询并返回游标"""
+        with self._lock:
+            return self._conn.execute(SQL_INCOME_DETAIL, _date_bounds(start_date, end_date))
+    
+    def _select_expense(self, start_date: str, end_date: str) -> sqlite3.Cursor:
+        """执行支出明细查询并返回游标"""
+        with self._lock:
+            return self._conn.execute(SQL_EXPENSE_DETAIL, _date_bounds(start_date, end_date))
+    
+    def export_income_excel(self, start_date: str, end_date: str, filename: str) -> int:
+        """导出收入明细到Excel，返回导出行数"""
+        return self._export_query_excel(SQL_INCOME_DETAIL, INCOME_EXPORT_HEADERS, '收入明细',
+                                        start_date, end_date, filename)
+    
+    def export_expense_excel(self, start_date: str, end_date: str, filename: str) -> int:
+        """导出支出明细到Excel，返回导出行数"""
+        return self._export_query_excel(SQL_EXPENSE_DETAIL, EXPENSE_EXPORT_HEADERS, '支出明细',
+                                        start_date, end_date, filename)
+    
+    def _export_query_excel(self, sql: str, headers: tuple, sheet_name: str,
+                            start_date: str, end_date: str, filename: str) -> int:
+        """以openpyxl只写模式将查询结果逐行写入Excel，不在内存中保留整张表"""
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append(headers)
+        
+        with self._lock:
+            cursor = self._conn.execute(sql, _date_bounds(start_date, end_date))
+        
+        count = 0
+        for batch in self._iter_batches(cursor, 500):
+            for row in batch:
+                sheet.append(tuple(row))
+            count += len(batch)
+        
+        workbook.save(filename)
+        return count
+    
+    def _iter_batches(self, cursor: sqlite3.Cursor, batch_size: int):
+        """按批次读取游标结果（每批读取时持有锁，批次之间允许其他线程使用连接）"""
+        while True:
+            with self._lock:
+                batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+    
+    @_cached_query
+    def get_income_data(self, start_date: str, end_date: str) -> Tuple[sqlite3.Row, ...]:
+        """获取收入数据（sqlite3.Row，可按列名索引，无需逐行构建字典）"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        s.id,
-                        s.sale_date,
-                        s.total_amount,
-                        s.discount_amount,
-                        s.final_amount,
-                        s.payment_method,
-                        s.notes,
-                        COUNT(si.id) as item_count
-                    FROM sales s
-                    LEFT JOIN sale_items si ON s.id = si.sale_id
-                    WHERE s.sale_date BETWEEN ? AND ?
-                    GROUP BY s.id
-                    ORDER BY s.sale_date DESC
-                """, (start_date, end_date))
-                
-                return [dict(row) for row in cursor.fetchall()]
+            return tuple(self._select_income(start_date, end_date).fetchall())
         except Exception as e:
             print(f"获取收入数据失败: {e}")
-            return []
+            return ()
     
-    def get_expense_data(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-        """获取支出数据"""
+    @_cached_query
+    def get_expense_data(self, start_date: str, end_date: str) -> Tuple[sqlite3.Row, ...]:
+        """获取支出数据（sqlite3.Row，可按列名索引，无需逐行构建字典）"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        id,
-                        expense_date,
-                        category,
-                        amount,
-                        description,
-                        payment_method
-                    FROM expenses
-                    WHERE expense_date BETWEEN ? AND ?
-                    ORDER BY expense_date DESC
-                """, (start_date, end_date))
-                
-                return [dict(row) for row in cursor.fetchall()]
+            return tuple(self._select_expense(start_date, end_date).fetchall())
+        except Exception as e:
+            print(f"获取支出数据失败: {e}")
+            return ()
+    
+    def iter_income_batches(self, start_date: str, end_date: str, batch_size: int = 500):
+        """分批获取收入数据，每批最多 batch_size 行"""
+        try:
+            cursor = self._select_income(start_date, end_date)
+        except Exception as e:
+            print(f"获取收入数据失败: {e}")
+            return
+        yield from self._iter_batches(cursor, batch_size)
+    
+    def iter_expense_batches(self, start_date: str, end_date: str, batch_size: int = 500):
+        """分批获取支出数据，每批最多 batch_size 行"""
+        try:
+            cursor = self._select_expense(start_date, end_date)
         except Exception as e:
             print(f"获取支出数据失败: {e}")
+            return
+        yield from self._iter_batches(cursor, batch_size)
+    
+    def get_income_summary(self, start_date: str, end_date: str) -> List[tuple]:
+        """按月汇总收入数据，返回 (月份, 金额合计, 笔数) 列表"""
+        try:
+            with self._lock:
+                return self._conn.execute(SQL_INCOME_MONTHLY, _date_bounds(start_date, end_date)).fetchall()
+        except Exception as e:
+            print(f"汇总收入数据失败: {e}")
             return []
     
-    def get_profit_analysis(self, start_date: str, end_date: str) -> Dict[str, Any]:
-        """获取利润分析数据"""
-        income_data = self.get_income_data(start_date, end_date)
-        expense_data = self.get_expense_data(start_date, end_date)
+    def get_expense_summary(self, start_date: str, end_date: str) -> List[tuple]:
+        """按月汇总支出数据，返回 (月份, 金额合计, 笔数) 列表"""
+        try:
+            with self._lock:
+                return self._conn.execute(SQL_EXPENSE_MONTHLY, _date_bounds(start_date, end_date)).fetchall()
+        except Exception as e:
+            print(f"汇总支出数据失败: {e}")
+            return []
+    
+    @_cached_query
+    def get_income_totals(self, start_date: str, end_date: str) -> tuple:
+        """在SQL中汇总收入，返回 (总额, 笔数, 平均金额)"""
+        try:
+            cursor = self._conn.execute(SQL_INCOME_TOTALS, _date_bounds(start_date, end_date))
+            return tuple(cursor.fetchone())
+        except Exception as e:
+            print(f"汇总收入数据失败: {e}")
+            return 0, 0, 0
+    
+    @_cached_query
+    def get_expense_totals(self, start_date: str, end_date: str) -> tuple:
+        """在SQL中汇总支出，返回 (总额, 笔数, 平均金额)"""
+        try:
+            cursor = self._conn.execute(SQL_EXPENSE_TOTALS, _date_bounds(start_date, end_date))
+            return tuple(cursor.fetchone())
+        except Exception as e:
+            print(f"汇总支出数据失败: {e}")
+            return 0, 0, 0
+    
+    @_cached_query
+    def get_profit_totals(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """获取利润汇总（KPI卡片使用，不含按月明细）"""
+        total_income, income_count, _ = self.get_income_totals(start_date, end_date)
+        total_expense, expense_count, _ = self.get_expense_totals(start_date, end_date)
+        
+        # 区间内无任何收支记录时直接返回零值
+        if not income_count and not expense_count:
+            return {
+                'total_income': 0,
+                'total_expense': 0,
+                'net_profit': 0,
+                'profit_margin': 0,
+                'income_count': 0,
+                'expense_count': 0
+            }
         
-        total_income = sum(item['final_amount'] for item in income_data)
-        total_expense = sum(item['amount'] for item in expense_data)
         net_profit = total_income - total_expense
         profit_margin = (net_profit / total_income * 100) if total_income > 0 else 0
         
-        # 按月统计
-        monthly_data = {}
-        for item in income_data:
-            month = item['sale_date'][:7]  # YYYY-MM
-            if month not in monthly_data:
-                monthly_data[month] = {'income': 0, 'expense': 0}
-            monthly_data[month]['income'] += item['final_amount']
-        
-        for item in expense_data:
-            month = item['expense_date'][:7]  # YYYY-MM
-            if month not in monthly_data:
-                monthly_data[month] = {'income': 0, 'expense': 0}
-            monthly_data[month]['expense'] += item['amount']
-        
         return {
             'total_income': total_income,
             'total_expense': total_expense,
             'net_profit': net_profit,
             'profit_margin': profit_margin,
-            'monthly_data': monthly_data,
-            'income_count': len(income_data),
-            'expense_count': len(expense_data)
+            'income_count': income_count,
+            'expense_count': expense_count
         }
     
+    @_cached_query
+    def get_monthly_profit(self, start_date: str, end_date: str) -> Dict[str, Dict[str, float]]:
+        """获取按月收支数据（图表使用），按月份升序排列"""
+        # 聚合在SQL中完成，只取回按月汇总的结果
+        income_summary = self.get_income_summary(start_date, end_date)
+        expense_summary = self.get_expense_summary(start_date, end_date)
+        if not income_summary and not expense_summary:
+            return {}
+        
+        monthly_income = {month: amount for month, amount, _ in income_summary}
+        monthly_expense = {month: amount for month, amount, _ in expense_summary}
+        
+        return {
+            month: {
+                'income': monthly_income.get(month, 0),
+                'expense': monthly_expense.get(month, 0)
+            }
+            for month in sorted(monthly_income.keys() | monthly_expense.keys())
+        }
+    
+    def get_profit_analysis(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """获取利润分析数据（汇总 + 按月明细）"""
+        return {
+            **self.get_profit_totals(start_date, end_date),
+            'monthly_data': self.get_monthly_profit(start_date, end_date)
+        }
+    
+    @_cached_query
     def get_cash_flow_data(self, start_date: str, end_date: str) -> Dict[str, Any]:
         """获取现金流数据"""
         income_data = self.get_income_data(start_date, end_date)
         expense_data = self.get_expense_data(start_date, end_date)
         
-        # 按日期汇总现金流
-        cash_flow = {}
-        
-        for item in income_data:
-            day = item['sale_date']
-            if day not in cash_flow:
-                cash_flow[day] = {'inflow': 0, 'outflow': 0}
-            cash_flow[day]['inflow'] += item['final_amount']
-        
-        for item in expense_data:
-            day = item['expense_date']
-            if day not in cash_flow:
-                cash_flow[day] = {'inflow': 0, 'outflow': 0}
-            cash_flow[day]['outflow'] += item['amount']
-        
-        # 排序并计算累计
-        sorted_days = sorted(cash_flow.keys())
-        cumulative = 0
-        cash_flow_list = []
-        
-        for day in sorted_days:
-            inflow = cash_flow[day]['inflow']
-            outflow = cash_flow[day]['outflow']
-            net_flow = inflow - outflow
-            cumulative += net_flow
-            
-            cash_flow_list.append({
-                'date': day,
-                'inflow': inflow,
-                'outflow': outflow,
-                'net_flow': net_flow,
-                'cumulative': cumulative
-            })
+        # 按日期汇总现金流并计算累计（向量化）
+        if HAS_PANDAS:
+            cash_flow_list = self._aggregate_cash_flow_pandas(income_data, expense_data)
+        else:
+            cash_flow_list = self._aggregate_cash_flow_numpy(income_data, expense_data)
         
         return {
             'daily_flow': cash_flow_list,
-            'total_inflow': sum(item['inflow'] for item in cash_flow_list),
-            'total_outflow': sum(item['outflow'] for item in cash_flow_list),
-            'net_cash_flow': sum(item['net_flow'] for item in cash_flow_list)
+            'total_inflow': math.fsum(map(itemgetter('inflow'), cash_flow_list)),
+            'total_outflow': math.fsum(map(itemgetter('outflow'), cash_flow_list)),
+            'net_cash_flow': math.fsum(map(itemgetter('net_flow'), cash_flow_list))
         }
+    
+    @staticmethod
+    def _aggregate_cash_flow_pandas(income_data: List[sqlite3.Row],
+                                    expense_data: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+        """使用pandas按日期汇总现金流"""
+        pd = _pandas()
+        # 日期列一次性解析并归并到天
+        inflow = pd.Series(
+            [item['final_amount'] for item in income_data],
+            index=pd.to_datetime([item['sale_date'] for item in income_data], format='ISO8601').normalize(),
+            dtype='float64'
+        ).groupby(level=0).sum()
+        outflow = pd.Series(
+            [item['amount'] for item in expense_data],
+            index=pd.to_datetime([item['expense_date'] for item in expense_data], format='ISO8601').normalize(),
+            dtype='float64'
+        ).groupby(level=0).sum()
+        
+        df = pd.concat([inflow, outflow], axis=1, keys=['inflow', 'outflow']).fillna(0).sort_index()
+        df['net_flow'] = df['inflow'] - df['outflow']
+        df['cumulative'] = df['net_flow'].cumsum()
+        df.index = df.index.strftime('%Y-%m-%d')
+        
+        return df.rename_axis('date').reset_index().to_dict('records')
+    
+    @staticmethod
+    def _aggregate_cash_flow_numpy(income_data: List[sqlite3.Row],
+                                   expense_data: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+        """未安装pandas时使用numpy按日期汇总现金流"""
+        days = [item['sale_date'] for item in income_data] + \
+               [item['expense_date'] for item in expense_data]
+        if not days:
+            return []
+        
+        # 日期字符串一次性转换为按天精度的datetime64
+        unique_days, inverse = np.unique(np.array(days, dtype=str).astype('datetime64[D]'),
+                                         return_inverse=True)
+        income_count = len(income_data)
+        inflow = np.bincount(
+            inverse[:income_count],
+            weights=np.array([item['final_amount'] for item in income_data], dtype=np.float64),
+            minlength=len(unique_days)
+        )
+        outflow = np.bincount(
+            inverse[income_count:],
+            weights=np.array([item['amount'] for item in expense_data], dtype=np.float64),
+            minlength=len(unique_days)
+        )
+        net_flow = inflow - outflow
+        cumulative = np.cumsum(net_flow)
+        
+        return [
+            {'date': day, 'inflow': i, 'outflow': o, 'net_flow': n, 'cumulative': c}
+            for day, i, o, n, c in zip(np.datetime_as_string(unique_days).tolist(),
+                                       inflow.tolist(), outflow.tolist(),
+                                       net_flow.tolist(), cumulative.tolist())
+        ]
 
 
 class DateRangeSelector(BaseFrame):
     """日期范围选择器"""
     
+    # 日期变更防抖间隔（毫秒）
+    DEBOUNCE_MS = 150
+    
     def __init__(self, parent: tk.Widget, **kwargs):
         self.on_date_change = kwargs.pop('on_date_change', None)
-        super().__init__(parent, **kwargs)
         self.start_date = None
         self.end_date = None
+        self._pending_after = None
+        super().__init__(parent, **kwargs)
     
     def create_widget(self):
         # 主容器
@@ -214,45 +574,35 @@ class DateRangeSelector(BaseFrame):
         ttk.Button(buttons_frame, text="本年", 
                   command=lambda: self._set_date_range('current_year')).pack(side='left', padx=2)
         
-        # 设置默认值为本月
-        self._set_date_range('current_month')
+        # 设置默认值为本月（初始数据由各标签页自行加载）
+        self._set_date_range('current_month', notify=False)
         
         # 绑定变更事件
         self.start_entry.bind('<FocusOut>', self._on_date_change)
         self.end_entry.bind('<FocusOut>', self._on_date_change)
     
-    def _set_date_range(self, period: str):
+    def _set_date_range(self, period: str, notify: bool = True):
         """设置日期范围"""
         today = date.today()
         
         if period == 'current_month':
             self.start_date = today.replace(day=1)
             # 获取本月最后一天
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            self.end_date = today.replace(day=last_day)
+            self.end_date = today.replace(day=_month_last_day(today.year, today.month))
             
         elif period == 'last_month':
             if today.month == 1:
                 self.start_date = today.replace(year=today.year-1, month=12, day=1)
-                last_day = calendar.monthrange(today.year-1, 12)[1]
-                self.end_date = today.replace(year=today.year-1, month=12, day=last_day)
+                self.end_date = today.replace(year=today.year-1, month=12, day=31)
             else:
                 self.start_date = today.replace(month=today.month-1, day=1)
-                last_day = calendar.monthrange(today.year, today.month-1)[1]
+                last_day = _month_last_day(today.year, today.month-1)
                 self.end_date = today.replace(month=today.month-1, day=last_day)
                 
         elif period == 'current_quarter':
-            quarter = (today.month - 1) // 3 + 1
-            start_month = (quarter - 1) * 3 + 1
+            start_month, end_month = _QUARTERS[today.month]
             self.start_date = today.replace(month=start_month, day=1)
-            end_month = start_month + 2
-            if end_month > 12:
-                end_month = 12
-                self.end_date = today.replace(year=today.year, month=end_month, 
-                                            day=calendar.monthrange(today.year, end_month)[1])
-            else:
-                self.end_date = today.replace(month=end_month, 
-                                            day=calendar.monthrange(today.year, end_month)[1])
+            self.end_date = today.replace(month=end_month, day=_month_last_day(today.year, end_month))
                 
         elif period == 'current_year':
             self.start_date = today.replace(month=1, day=1)
@@ -264,10 +614,18 @@ class DateRangeSelector(BaseFrame):
             self.start_entry.insert(0, self.start_date.strftime('%Y-%m-%d'))
             self.end_entry.delete(0, tk.END)
             self.end_entry.insert(0, self.end_date.strftime('%Y-%m-%d'))
-            self._on_date_change()
+            if notify:
+                self._on_date_change()
     
     def _on_date_change(self, event=None):
-        """日期变更事件"""
+        """日期变更事件（防抖，短时间内的多次变更只触发一次）"""
+        if self._pending_after:
+            self.main_frame.after_cancel(self._pending_after)
+        self._pending_after = self.main_frame.after(self.DEBOUNCE_MS, self._fire_change)
+    
+    def _fire_change(self):
+        """解析日期并通知变更"""
+        self._pending_after = None
         try:
             start_str = self.start_entry.get()
             end_str = self.end_entry.get()
@@ -294,6 +652,14 @@ class ChartCanvas(BaseFrame):
         self.chart_type = chart_type
         self.figure = None
         self.canvas = None
+        # 复用的图形对象，刷新时原地更新数据
+        self._line = None
+        self._bars = None
+        # blit 使用的背景缓存及其对应的坐标轴状态
+        self._background = None
+        self._view_state = None
+        # 图形创建前收到的最近一次绘图请求
+        self._deferred_plot = None
         super().__init__(parent, **kwargs)
     
     def create_widget(self):
@@ -309,57 +675,128 @@ class ChartCanvas(BaseFrame):
         self.main_frame = ttk.Frame(self.parent)
         self.widget = self.main_frame
         
+        # 图形和画布在容器首次显示时才创建（所在标签页未打开时不占用资源）
+        self._map_binding = self.main_frame.bind('<Map>', self._on_first_map, add='+')
+    
+    def _on_first_map(self, event):
+        """容器首次显示时创建图形，并补绘之前收到的绘图请求"""
+        self.main_frame.unbind('<Map>', self._map_binding)
+        self._build_figure()
+        
+        if self._deferred_plot:
+            plot, args = self._deferred_plot
+            self._deferred_plot = None
+            plot(*args)
+    
+    def _build_figure(self):
+        """创建matplotlib图形和画布"""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
         # 创建matplotlib图形
         self.figure = Figure(figsize=(10, 6), dpi=100)
         self.ax = self.figure.add_subplot(111)
         
+        # 主题配色在运行期间不变，创建时取一次
+        colors = win11_theme.colors
+        self._bar_color = colors['primary']
+        self._pie_palette = [colors[key] for key in
+                             ('primary', 'secondary', 'accent', 'success', 'warning', 'error')]
+        
         # 创建画布
         self.canvas = FigureCanvasTkAgg(self.figure, self.main_frame)
         self.canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def plot_line_chart(self, x_data, y_data, title: str, x_label: str, y_label: str):
-        """绘制线图"""
-        if not HAS_MATPLOTLIB or not self.figure:
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+    
+    def _on_draw(self, event):
+        """整图重绘后缓存不含数据图形的背景，并补画数据图形"""
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_data_artists()
+    
+    def _draw_data_artists(self):
+        """绘制数据图形（线条/柱子设置为animated，不包含在整图重绘中）"""
+        if self._line is not None:
+            self.ax.draw_artist(self._line)
+        if self._bars is not None:
+            for rect in self._bars:
+                self.ax.draw_artist(rect)
+    
+    def _refresh(self, x_labels: list, title: str, x_label: str, y_label: str):
+        """刷新画布：坐标轴与文字未变化时只 blit 数据图形，否则整图重绘"""
+        self.ax.relim()
+        self.ax.autoscale_view()
+        view_state = (self.ax.get_xlim(), self.ax.get_ylim(), x_labels, title, x_label, y_label)
+        
+        if self._background is not None and view_state == self._view_state:
+            self.canvas.restore_region(self._background)
+            self._draw_data_artists()
+            self.canvas.blit(self.ax.bbox)
             return
         
-        self.ax.clear()
-        self.ax.plot(x_data, y_data, marker='o', linewidth=2, markersize=6)
+        self._view_state = view_state
+        self.ax.set_xticks(range(len(x_labels)), labels=x_labels)
         self.ax.set_title(title, fontsize=14, fontweight='bold')
         self.ax.set_xlabel(x_label)
         self.ax.set_ylabel(y_label)
-        self.ax.grid(True, alpha=0.3)
         self.figure.tight_layout()
-        self.canvas.draw()
+        self.canvas.draw_idle()
+    
+    def plot_line_chart(self, x_data, y_data, title: str, x_label: str, y_label: str):
+        """绘制线图"""
+        if not HAS_MATPLOTLIB:
+            return
+        if not self.figure:
+            self._deferred_plot = (self.plot_line_chart, (x_data, y_data, title, x_label, y_label))
+            return
+        
+        # 首次绘制时创建线条，之后只更新数据
+        if self._line is None:
+            self._line, = self.ax.plot([], [], marker='o', linewidth=2, markersize=6, animated=True)
+            self.ax.grid(True, alpha=0.3)
+        
+        self._line.set_data(range(len(x_data)), y_data)
+        self._refresh(list(x_data), title, x_label, y_label)
     
     def plot_bar_chart(self, x_data, y_data, title: str, x_label: str, y_label: str):
         """绘制柱状图"""
-        if not HAS_MATPLOTLIB or not self.figure:
+        if not HAS_MATPLOTLIB:
+            return
+        if not self.figure:
+            self._deferred_plot = (self.plot_bar_chart, (x_data, y_data, title, x_label, y_label))
             return
         
-        self.ax.clear()
-        self.ax.bar(x_data, y_data, color=win11_theme.colors['primary'], alpha=0.7)
-        self.ax.set_title(title, fontsize=14, fontweight='bold')
-        self.ax.set_xlabel(x_label)
-        self.ax.set_ylabel(y_label)
-        self.ax.grid(True, alpha=0.3, axis='y')
-        self.figure.tight_layout()
-        self.canvas.draw()
+        if self._bars is not None and len(self._bars) == len(y_data):
+            # 柱数不变时只更新高度
+            for rect, height in zip(self._bars, y_data):
+                rect.set_height(height)
+        else:
+            if self._bars is None:
+                self.ax.grid(True, alpha=0.3, axis='y')
+            else:
+                self._bars.remove()
+            self._bars = self.ax.bar(range(len(x_data)), y_data, color=self._bar_color, alpha=0.7)
+            for rect in self._bars:
+                rect.set_animated(True)
+            # 柱子对象已更换，强制整图重绘
+            self._view_state = None
+        
+        self._refresh(list(x_data), title, x_label, y_label)
     
     def plot_pie_chart(self, data, labels, title: str):
         """绘制饼图"""
-        if not HAS_MATPLOTLIB or not self.figure:
+        if not HAS_MATPLOTLIB:
+            return
+        if not self.figure:
+            self._deferred_plot = (self.plot_pie_chart, (data, labels, title))
             return
         
+        # 饼图扇区数量和标签随数据变化，仍整体重绘
         self.ax.clear()
-        colors = [win11_theme.colors['primary'], win11_theme.colors['secondary'], 
-                 win11_theme.colors['accent'], win11_theme.colors['success'],
-                 win11_theme.colors['warning'], win11_theme.colors['error']]
-        
         self.ax.pie(data, labels=labels, autopct='%1.1f%%', 
-                   colors=colors[:len(data)], startangle=90)
+                   colors=self._pie_palette[:len(data)], startangle=90)
         self.ax.set_title(title, fontsize=14, fontweight='bold')
         self.figure.tight_layout()
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
 
 class IncomeStatementTab(BaseFrame):
@@ -367,6 +804,9 @@ class IncomeStatementTab(BaseFrame):
     
     def __init__(self, parent: tk.Widget, data_manager: FinancialDataManager, **kwargs):
         self.data_manager = data_manager
+        self._batches = None  # 正在分批加载的数据批次
+        self._batch_job = None
+        self._chart_rows = []
         super().__init__(parent, **kwargs)
     
     def create_widget(self):
@@ -422,6 +862,7 @@ class IncomeStatementTab(BaseFrame):
     
     def _create_summary_cards(self):
         """创建汇总卡片"""
+        palette = win11_theme.colors
         cards_frame = ttk.Frame(self.main_frame)
         cards_frame.pack(fill='x', padx=20, pady=10)
         
@@ -440,7 +881,7 @@ class IncomeStatementTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.total_income_label = ttk.Label(self.total_income_card, text="¥0.00", 
                                            font=('Segoe UI', 16, 'bold'),
-                                           foreground=win11_theme.colors['success'])
+                                           foreground=palette['success'])
         self.total_income_label.pack()
         
         # 订单数量卡片
@@ -451,7 +892,7 @@ class IncomeStatementTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.order_count_label = ttk.Label(self.order_count_card, text="0", 
                                           font=('Segoe UI', 16, 'bold'),
-                                          foreground=win11_theme.colors['primary'])
+                                          foreground=palette['primary'])
         self.order_count_label.pack()
         
         # 平均订单金额卡片
@@ -462,7 +903,7 @@ class IncomeStatementTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.avg_amount_label = ttk.Label(self.avg_amount_card, text="¥0.00", 
                                          font=('Segoe UI', 16, 'bold'),
-                                         foreground=win11_theme.colors['accent'])
+                                         foreground=palette['accent'])
         self.avg_amount_label.pack()
     
     def _on_date_change(self, start_date: date, end_date: date):
@@ -471,51 +912,97 @@ class IncomeStatementTab(BaseFrame):
     
     def _load_data(self, start_date: str, end_date: str):
         """加载数据"""
-        # 获取收入数据
-        income_data = self.data_manager.get_income_data(start_date, end_date)
-        
-        # 转换数据格式
-        table_data = []
-        for item in income_data:
-            table_data.append({
-                '日期': item['sale_date'],
-                '订单号': f"ORD-{item['id']:04d}",
-                '商品数量': f"{item['item_count']}件",
-                '原价': f"¥{item['total_amount']:.2f}",
-                '折扣': f"¥{item['discount_amount']:.2f}",
-                '实收金额': f"¥{item['final_amount']:.2f}",
-                '支付方式': item['payment_method'] or '未设置',
-                '备注': item['notes'] or ''
-            })
-        
-        # 加载到表格
-        self.income_table.load_data(table_data)
-        
-        # 更新汇总数据
-        total_income = sum(item['final_amount'] for item in income_data)
-        order_count = len(income_data)
-        avg_amount = total_income / order_count if order_count > 0 else 0
+        # 汇总卡片直接使用SQL聚合结果，先于明细刷新
+        self._update_summary_cards(start_date, end_date)
+        
+        # 明细分批加载，避免大范围日期阻塞界面
+        self._cancel_batch_load()
+        self.income_table.load_data([])
+        self._chart_rows = []
+        self._batches = self.data_manager.iter_income_batches(start_date, end_date)
+        self._batch_job = self.main_frame.after_idle(self._load_next_batch)
+    
+    def _cancel_batch_load(self):
+        """取消尚未完成的分批加载"""
+        if self._batch_job:
+            self.main_frame.after_cancel(self._batch_job)
+            self._batch_job = None
+        if self._batches:
+            self._batches.close()
+            self._batches = None
+    
+    def _load_next_batch(self):
+        """加载下一批明细数据"""
+        self._batch_job = None
+        batch = next(self._batches, None)
+        
+        if batch is None:
+            self._batches = None
+            # 全部加载完成后绘制图表
+            if HAS_MATPLOTLIB and self._chart_rows:
+                # 保留数值列供图表使用，避免从格式化字符串反解析金额
+                self._income_df = _pandas().DataFrame.from_records(
+                    self._chart_rows, columns=['date', 'amount']
+                )
+                self._plot_income_chart(self._income_df)
+            return
+        
+        # 转换数据格式并追加到表格
+        self.income_table.insert_rows(self._format_batch(batch))
+        self._chart_rows.extend((item['sale_date'], item['final_amount']) for item in batch)
+        
+        self._batch_job = self.main_frame.after_idle(self._load_next_batch)
+    
+    @classmethod
+    def _format_batch(cls, batch: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+        """按列批量格式化一批数据"""
+        if not HAS_PANDAS:
+            return [cls._format_row(item) for item in batch]
+        
+        pd = _pandas()
+        df = pd.DataFrame.from_records(batch, columns=batch[0].keys())
+        # 空值（NULL）按 0 显示，避免格式化成 nan
+        amounts = df[['total_amount', 'discount_amount', 'final_amount']].fillna(0)
+        return pd.DataFrame({
+            '日期': df['sale_date'].fillna(''),
+            '订单号': 'ORD-' + df['id'].astype(str).str.zfill(4),
+            '商品数量': df['item_count'].fillna(0).astype(int).astype(str) + '件',
+            '原价': amounts['total_amount'].map('¥{:.2f}'.format),
+            '折扣': amounts['discount_amount'].map('¥{:.2f}'.format),
+            '实收金额': amounts['final_amount'].map('¥{:.2f}'.format),
+            '支付方式': df['payment_method'].fillna('').replace('', '未设置'),
+            '备注': df['notes'].fillna('')
+        }).to_dict('records')
+    
+    @staticmethod
+    def _format_row(item: sqlite3.Row) -> Dict[str, Any]:
+        """转换为表格行"""
+        return {
+            '日期': item['sale_date'] or '',
+            '订单号': f"ORD-{item['id']:04d}",
+            '商品数量': f"{item['item_count'] or 0}件",
+            '原价': f"¥{item['total_amount'] or 0:.2f}",
+            '折扣': f"¥{item['discount_amount'] or 0:.2f}",
+            '实收金额': f"¥{item['final_amount'] or 0:.2f}",
+            '支付方式': item['payment_method'] or '未设置',
+            '备注': item['notes'] or ''
+        }
+    
+    def _update_summary_cards(self, start_date: str, end_date: str):
+        """更新汇总卡片"""
+        total_income, order_count, avg_amount = self.data_manager.get_income_totals(start_date, end_date)
         
         self.total_income_label.config(text=f"¥{total_income:,.2f}")
         self.order_count_label.config(text=str(order_count))
         self.avg_amount_label.config(text=f"¥{avg_amount:.2f}")
-        
-        # 绘制图表
-        if HAS_MATPLOTLIB and table_data:
-            self._plot_income_chart(table_data)
     
-    def _plot_income_chart(self, data: List[Dict]):
+    def _plot_income_chart(self, data: 'pd.DataFrame'):
         """绘制收入图表"""
-        # 按日期汇总收入
-        daily_income = {}
-        for item in data:
-            date = item['日期']
-            amount = float(item['实收金额'].replace('¥', '').replace(',', ''))
-            daily_income[date] = daily_income.get(date, 0) + amount
-        
-        # 排序并准备数据
-        dates = sorted(daily_income.keys())
-        amounts = [daily_income[date] for date in dates]
+        # 一次性解析日期并归并到天，再向量化分组求和（结果按日期排序）
+        days = _pandas().to_datetime(data['date'], format='ISO8601').dt.normalize()
+        daily_income = data['amount'].groupby(days, sort=True).sum()
+        dates = daily_income.index.strftime('%Y-%m-%d').tolist()
+        amounts = daily_income.tolist()
         
         # 绘制线图
         self.chart_canvas.plot_line_chart(
@@ -527,8 +1014,21 @@ class IncomeStatementTab(BaseFrame):
     def _export_excel(self):
         """导出Excel"""
         try:
-            # 这里可以集成pandas和openpyxl来导出Excel
-            messagebox.showinfo("提示", "Excel导出功能正在开发中...")
+            start_date, end_date = self.date_selector.get_date_range()
+            if not (start_date and end_date):
+                messagebox.showwarning("提示", "请先选择日期范围")
+                return
+            
+            filename = filedialog.asksaveasfilename(
+                title="导出收入明细",
+                defaultextension=".xlsx",
+                filetypes=[('Excel文件', '*.xlsx')]
+            )
+            if filename:
+                count = self.data_manager.export_income_excel(
+                    start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'), filename
+                )
+                messagebox.showinfo("成功", f"已导出 {count} 条记录到: {filename}")
         except Exception as e:
             messagebox.showerror("错误", f"导出失败: {str(e)}")
 
@@ -538,6 +1038,9 @@ class ExpenseStatementTab(BaseFrame):
     
     def __init__(self, parent: tk.Widget, data_manager: FinancialDataManager, **kwargs):
         self.data_manager = data_manager
+        self._batches = None  # 正在分批加载的数据批次
+        self._batch_job = None
+        self._chart_rows = []
         super().__init__(parent, **kwargs)
     
     def create_widget(self):
@@ -593,6 +1096,7 @@ class ExpenseStatementTab(BaseFrame):
     
     def _create_summary_cards(self):
         """创建汇总卡片"""
+        palette = win11_theme.colors
         cards_frame = ttk.Frame(self.main_frame)
         cards_frame.pack(fill='x', padx=20, pady=10)
         
@@ -611,7 +1115,7 @@ class ExpenseStatementTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.total_expense_label = ttk.Label(self.total_expense_card, text="¥0.00", 
                                             font=('Segoe UI', 16, 'bold'),
-                                            foreground=win11_theme.colors['error'])
+                                            foreground=palette['error'])
         self.total_expense_label.pack()
         
         # 支出笔数卡片
@@ -622,7 +1126,7 @@ class ExpenseStatementTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.expense_count_label = ttk.Label(self.expense_count_card, text="0", 
                                             font=('Segoe UI', 16, 'bold'),
-                                            foreground=win11_theme.colors['primary'])
+                                            foreground=palette['primary'])
         self.expense_count_label.pack()
         
         # 平均支出金额卡片
@@ -633,7 +1137,7 @@ class ExpenseStatementTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.avg_expense_label = ttk.Label(self.avg_expense_card, text="¥0.00", 
                                           font=('Segoe UI', 16, 'bold'),
-                                          foreground=win11_theme.colors['warning'])
+                                          foreground=palette['warning'])
         self.avg_expense_label.pack()
     
     def _on_date_change(self, start_date: date, end_date: date):
@@ -642,48 +1146,88 @@ class ExpenseStatementTab(BaseFrame):
     
     def _load_data(self, start_date: str, end_date: str):
         """加载数据"""
-        # 获取支出数据
-        expense_data = self.data_manager.get_expense_data(start_date, end_date)
-        
-        # 转换数据格式
-        table_data = []
-        for item in expense_data:
-            table_data.append({
-                '日期': item['expense_date'],
-                '类别': item['category'],
-                '金额': f"¥{item['amount']:.2f}",
-                '描述': item['description'] or '',
-                '支付方式': item['payment_method'] or ''
-            })
-        
-        # 加载到表格
-        self.expense_table.load_data(table_data)
-        
-        # 更新汇总数据
-        total_expense = sum(item['amount'] for item in expense_data)
-        expense_count = len(expense_data)
-        avg_expense = total_expense / expense_count if expense_count > 0 else 0
+        # 汇总卡片直接使用SQL聚合结果，先于明细刷新
+        self._update_summary_cards(start_date, end_date)
+        
+        # 明细分批加载，避免大范围日期阻塞界面
+        self._cancel_batch_load()
+        self.expense_table.load_data([])
+        self._chart_rows = []
+        self._batches = self.data_manager.iter_expense_batches(start_date, end_date)
+        self._batch_job = self.main_frame.after_idle(self._load_next_batch)
+    
+    def _cancel_batch_load(self):
+        """取消尚未完成的分批加载"""
+        if self._batch_job:
+            self.main_frame.after_cancel(self._batch_job)
+            self._batch_job = None
+        if self._batches:
+            self._batches.close()
+            self._batches = None
+    
+    def _load_next_batch(self):
+        """加载下一批明细数据"""
+        self._batch_job = None
+        batch = next(self._batches, None)
+        
+        if batch is None:
+            self._batches = None
+            # 全部加载完成后绘制图表
+            if HAS_MATPLOTLIB and self._chart_rows:
+                # 保留数值列供图表使用，避免从格式化字符串反解析金额
+                self._expense_df = _pandas().DataFrame.from_records(
+                    self._chart_rows, columns=['category', 'amount']
+                )
+                self._plot_expense_chart(self._expense_df)
+            return
+        
+        # 转换数据格式并追加到表格
+        self.expense_table.insert_rows(self._format_batch(batch))
+        self._chart_rows.extend((item['category'], item['amount']) for item in batch)
+        
+        self._batch_job = self.main_frame.after_idle(self._load_next_batch)
+    
+    @classmethod
+    def _format_batch(cls, batch: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+        """按列批量格式化一批数据"""
+        if not HAS_PANDAS:
+            return [cls._format_row(item) for item in batch]
+        
+        pd = _pandas()
+        df = pd.DataFrame.from_records(batch, columns=batch[0].keys())
+        return pd.DataFrame({
+            '日期': df['expense_date'].fillna(''),
+            '类别': df['category'].fillna(''),
+            '金额': df['amount'].fillna(0).map('¥{:.2f}'.format),
+            '描述': df['description'].fillna(''),
+            '支付方式': df['payment_method'].fillna('')
+        }).to_dict('records')
+    
+    @staticmethod
+    def _format_row(item: sqlite3.Row) -> Dict[str, Any]:
+        """转换为表格行"""
+        return {
+            '日期': item['expense_date'] or '',
+            '类别': item['category'] or '',
+            '金额': f"¥{item['amount'] or 0:.2f}",
+            '描述': item['description'] or '',
+            '支付方式': item['payment_method'] or ''
+        }
+    
+    def _update_summary_cards(self, start_date: str, end_date: str):
+        """更新汇总卡片"""
+        total_expense, expense_count, avg_expense = self.data_manager.get_expense_totals(start_date, end_date)
         
         self.total_expense_label.config(text=f"¥{total_expense:,.2f}")
         self.expense_count_label.config(text=str(expense_count))
         self.avg_expense_label.config(text=f"¥{avg_expense:.2f}")
-        
-        # 绘制图表
-        if HAS_MATPLOTLIB and table_data:
-            self._plot_expense_chart(table_data)
     
-    def _plot_expense_chart(self, data: List[Dict]):
+    def _plot_expense_chart(self, data: 'pd.DataFrame'):
         """绘制支出图表"""
-        # 按类别汇总支出
-        category_expense = {}
-        for item in data:
-            category = item['类别']
-            amount = float(item['金额'].replace('¥', '').replace(',', ''))
-            category_expense[category] = category_expense.get(category, 0) + amount
-        
-        # 准备数据
-        categories = list(category_expense.keys())
-        amounts = list(category_expense.values())
+        # 按类别汇总支出（保持类别首次出现的顺序）
+        category_expense = data.groupby('category', sort=False)['amount'].sum()
+        categories = category_expense.index.tolist()
+        amounts = category_expense.tolist()
         
         # 绘制饼图
         self.chart_canvas.plot_pie_chart(
@@ -693,7 +1237,21 @@ class ExpenseStatementTab(BaseFrame):
     def _export_excel(self):
         """导出Excel"""
         try:
-            messagebox.showinfo("提示", "Excel导出功能正在开发中...")
+            start_date, end_date = self.date_selector.get_date_range()
+            if not (start_date and end_date):
+                messagebox.showwarning("提示", "请先选择日期范围")
+                return
+            
+            filename = filedialog.asksaveasfilename(
+                title="导出支出明细",
+                defaultextension=".xlsx",
+                filetypes=[('Excel文件', '*.xlsx')]
+            )
+            if filename:
+                count = self.data_manager.export_expense_excel(
+                    start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'), filename
+                )
+                messagebox.showinfo("成功", f"已导出 {count} 条记录到: {filename}")
         except Exception as e:
             messagebox.showerror("错误", f"导出失败: {str(e)}")
 
@@ -701,8 +1259,14 @@ class ExpenseStatementTab(BaseFrame):
 class ProfitAnalysisTab(BaseFrame):
     """利润分析报告标签页"""
     
+    # 轮询后台查询结果的间隔（毫秒）
+    POLL_INTERVAL = 50
+    
     def __init__(self, parent: tk.Widget, data_manager: FinancialDataManager, **kwargs):
         self.data_manager = data_manager
+        # 数据查询在后台线程执行，避免阻塞界面
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = None  # 最近一次查询的 Future
         super().__init__(parent, **kwargs)
     
     def create_widget(self):
@@ -765,6 +1329,7 @@ class ProfitAnalysisTab(BaseFrame):
     
     def _create_kpi_cards(self):
         """创建关键指标卡片"""
+        palette = win11_theme.colors
         kpi_frame = ttk.Frame(self.main_frame)
         kpi_frame.pack(fill='x', padx=20, pady=10)
         
@@ -783,8 +1348,9 @@ class ProfitAnalysisTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.net_profit_label = ttk.Label(self.net_profit_card, text="¥0.00", 
                                          font=('Segoe UI', 16, 'bold'),
-                                         foreground=win11_theme.colors['success'])
+                                         foreground=palette['success'])
         self.net_profit_label.pack()
+        self._set_net_profit = self.net_profit_label.configure
         
         # 利润率卡片
         self.profit_margin_card = ttk.Frame(kpi_frame, **card_style)
@@ -794,8 +1360,9 @@ class ProfitAnalysisTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.profit_margin_label = ttk.Label(self.profit_margin_card, text="0%", 
                                             font=('Segoe UI', 16, 'bold'),
-                                            foreground=win11_theme.colors['primary'])
+                                            foreground=palette['primary'])
         self.profit_margin_label.pack()
+        self._set_profit_margin = self.profit_margin_label.configure
         
         # 收支比卡片
         self.ratio_card = ttk.Frame(kpi_frame, **card_style)
@@ -805,65 +1372,113 @@ class ProfitAnalysisTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.ratio_label = ttk.Label(self.ratio_card, text="1:0", 
                                     font=('Segoe UI', 16, 'bold'),
-                                    foreground=win11_theme.colors['accent'])
+                                    foreground=palette['accent'])
         self.ratio_label.pack()
+        self._set_ratio = self.ratio_label.configure
     
     def _on_date_change(self, start_date: date, end_date: date):
         """日期变更事件"""
         self._load_data(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
     
     def _load_data(self, start_date: str, end_date: str):
-        """加载数据"""
-        # 获取利润分析数据
-        profit_data = self.data_manager.get_profit_analysis(start_date, end_date)
+        """加载数据（后台查询，完成后在主线程更新界面）"""
+        future = self._executor.submit(self._fetch_data, start_date, end_date)
+        self._pending = future
+        self.main_frame.after(self.POLL_INTERVAL, self._poll_result, future)
+    
+    def _fetch_data(self, start_date: str, end_date: str) -> tuple:
+        """在后台线程获取利润汇总（按月明细仅在需要绘图时获取）"""
+        profit_data = self.data_manager.get_profit_totals(start_date, end_date)
+        monthly_data = self.data_manager.get_monthly_profit(start_date, end_date) if HAS_MATPLOTLIB else None
+        return profit_data, monthly_data
+    
+    def _poll_result(self, future):
+        """检查后台查询是否完成；Tk 控件只能在主线程中更新"""
+        if self._pending is not future:
+            # 已有更新的查询，丢弃过期结果
+            return
+        if not future.done():
+            self.main_frame.after(self.POLL_INTERVAL, self._poll_result, future)
+            return
+        
+        self._pending = None
+        try:
+            profit_data, monthly_data = future.result()
+        except Exception as e:
+            print(f"加载利润数据失败: {e}")
+            return
+        self._apply_data(profit_data, monthly_data)
+    
+    def _apply_data(self, profit_data: Dict, monthly_data: Dict):
+        """将查询结果更新到界面"""
+        total_income = profit_data['total_income']
+        total_expense = profit_data['total_expense']
         
         # 更新KPI卡片
-        self.net_profit_label.config(text=f"¥{profit_data['net_profit']:,.2f}")
-        self.profit_margin_label.config(text=f"{profit_data['profit_margin']:.1f}%")
+        self._set_net_profit(text=_FMT_YUAN(profit_data['net_profit']))
+        self._set_profit_margin(text=_FMT_PCT(profit_data['profit_margin']))
         
-        if profit_data['total_expense'] > 0:
-            ratio = profit_data['total_income'] / profit_data['total_expense']
-            self.ratio_label.config(text=f"1:{ratio:.2f}")
+        if total_expense > 0:
+            self._set_ratio(text=f"1:{total_income / total_expense:.2f}")
         else:
-            self.ratio_label.config(text="1:0")
+            self._set_ratio(text="1:0")
         
         # 更新详细分析表格
         self._update_analysis_table(profit_data)
         
         # 绘制图表
         if HAS_MATPLOTLIB:
-            self._plot_charts(profit_data)
+            self._plot_charts(profit_data, monthly_data)
+    
+    def destroy(self):
+        """销毁组件并停止后台线程"""
+        self._pending = None
+        self._executor.shutdown(wait=False)
+        super().destroy()
     
     def _update_analysis_table(self, profit_data: Dict):
         """更新分析表格"""
+        total_income = profit_data['total_income']
+        total_expense = profit_data['total_expense']
+        net_profit = profit_data['net_profit']
+        income_count = profit_data['income_count']
+        expense_count = profit_data['expense_count']
+        
+        # 占比只在有收入时计算一次
+        if total_income > 0:
+            expense_ratio = _FMT_PCT(total_expense / total_income * 100)
+            profit_ratio = _FMT_PCT(net_profit / total_income * 100)
+        else:
+            expense_ratio = profit_ratio = "0%"
+        
         analysis_data = [
             {
                 '指标': '总收入',
-                '当前值': f"¥{profit_data['total_income']:,.2f}",
+                '当前值': _FMT_YUAN(total_income),
                 '占比': '100.0%',
                 '评估': '✓ 正常'
             },
             {
                 '指标': '总支出',
-                '当前值': f"¥{profit_data['total_expense']:,.2f}",
-                '占比': f"{(profit_data['total_expense']/profit_data['total_income']*100):.1f}%" if profit_data['total_income'] > 0 else "0%",
-                '评估': '✓ 正常' if profit_data['total_expense'] < profit_data['total_income'] else '⚠ 过高'
+                '当前值': _FMT_YUAN(total_expense),
+                '占比': expense_ratio,
+                '评估': '✓ 正常' if total_expense < total_income else '⚠ 过高'
             },
             {
                 '指标': '净利润',
-                '当前值': f"¥{profit_data['net_profit']:,.2f}",
-                '占比': f"{(profit_data['net_profit']/profit_data['total_income']*100):.1f}%" if profit_data['total_income'] > 0 else "0%",
-                '评估': '✓ 盈利' if profit_data['net_profit'] > 0 else '⚠ 亏损'
+                '当前值': _FMT_YUAN(net_profit),
+                '占比': profit_ratio,
+                '评估': '✓ 盈利' if net_profit > 0 else '⚠ 亏损'
             },
             {
                 '指标': '收入笔数',
-                '当前值': f"{profit_data['income_count']}笔",
+                '当前值': f"{income_count}笔",
                 '占比': '-',
                 '评估': '✓ 正常'
             },
             {
                 '指标': '支出笔数',
-                '当前值': f"{profit_data['expense_count']}笔",
+                '当前值': f"{expense_count}笔",
                 '占比': '-',
                 '评估': '✓ 正常'
             }
@@ -871,18 +1486,18 @@ class ProfitAnalysisTab(BaseFrame):
         
         self.analysis_table.load_data(analysis_data)
     
-    def _plot_charts(self, profit_data: Dict):
+    def _plot_charts(self, profit_data: Dict, monthly_data: Dict):
         """绘制图表"""
         # 月度利润趋势图
-        monthly_data = profit_data['monthly_data']
         if monthly_data:
-            months = sorted(monthly_data.keys())
-            profits = []
-            
-            for month in months:
-                month_data = monthly_data[month]
-                profit = month_data['income'] - month_data['expense']
-                profits.append(profit)
+            # 数据层已按月份排序
+            months = list(monthly_data)
+            # 收入、支出各取一次，向量化计算每月利润
+            income = np.fromiter((monthly_data[m]['income'] for m in months),
+                                 dtype=np.float64, count=len(months))
+            expense = np.fromiter((monthly_data[m]['expense'] for m in months),
+                                  dtype=np.float64, count=len(months))
+            profits = (income - expense).tolist()
             
             self.profit_chart.plot_line_chart(
                 months, profits,
@@ -900,10 +1515,7 @@ class ProfitAnalysisTab(BaseFrame):
     
     def _export_report(self):
         """导出报告"""
-        try:
-            messagebox.showinfo("提示", "报告导出功能正在开发中...")
-        except Exception as e:
-            messagebox.showerror("错误", f"导出失败: {str(e)}")
+        messagebox.showinfo("提示", "报告导出功能正在开发中...")
 
 
 class CashFlowTab(BaseFrame):
@@ -911,6 +1523,10 @@ class CashFlowTab(BaseFrame):
     
     def __init__(self, parent: tk.Widget, data_manager: FinancialDataManager, **kwargs):
         self.data_manager = data_manager
+        # 增量加载状态：上次的日期范围、已展示的现金流数据及其对应的缓存代数
+        self._last_range = None
+        self._cashflow = None
+        self._generation = None
         super().__init__(parent, **kwargs)
     
     def create_widget(self):
@@ -977,6 +1593,7 @@ class CashFlowTab(BaseFrame):
     
     def _create_cashflow_summary(self):
         """创建现金流摘要"""
+        palette = win11_theme.colors
         summary_frame = ttk.Frame(self.main_frame)
         summary_frame.pack(fill='x', padx=20, pady=10)
         
@@ -995,8 +1612,9 @@ class CashFlowTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.total_inflow_label = ttk.Label(inflow_card, text="¥0.00", 
                                            font=('Segoe UI', 14, 'bold'),
-                                           foreground=win11_theme.colors['success'])
+                                           foreground=palette['success'])
         self.total_inflow_label.pack()
+        self._set_total_inflow = self.total_inflow_label.configure
         
         # 总流出
         outflow_card = ttk.Frame(summary_frame, **card_style)
@@ -1006,8 +1624,9 @@ class CashFlowTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.total_outflow_label = ttk.Label(outflow_card, text="¥0.00", 
                                             font=('Segoe UI', 14, 'bold'),
-                                            foreground=win11_theme.colors['error'])
+                                            foreground=palette['error'])
         self.total_outflow_label.pack()
+        self._set_total_outflow = self.total_outflow_label.configure
         
         # 净现金流
         net_card = ttk.Frame(summary_frame, **card_style)
@@ -1017,8 +1636,9 @@ class CashFlowTab(BaseFrame):
                  font=('Segoe UI', 10, 'bold')).pack()
         self.net_cashflow_label = ttk.Label(net_card, text="¥0.00", 
                                            font=('Segoe UI', 14, 'bold'),
-                                           foreground=win11_theme.colors['primary'])
+                                           foreground=palette['primary'])
         self.net_cashflow_label.pack()
+        self._set_net_cashflow = self.net_cashflow_label.configure
     
     def _on_date_change(self, start_date: date, end_date: date):
         """日期变更事件"""
@@ -1026,47 +1646,91 @@ class CashFlowTab(BaseFrame):
     
     def _load_data(self, start_date: str, end_date: str):
         """加载数据"""
-        # 获取现金流数据
-        cashflow_data = self.data_manager.get_cash_flow_data(start_date, end_date)
-        
-        # 转换数据格式
-        table_data = []
-        for item in cashflow_data['daily_flow']:
-            table_data.append({
-                '日期': item['date'],
-                '现金流入': f"¥{item['inflow']:,.2f}",
-                '现金流出': f"¥{item['outflow']:,.2f}",
-                '净现金流': f"¥{item['net_flow']:,.2f}",
-                '累计现金流': f"¥{item['cumulative']:,.2f}"
-            })
-        
-        # 加载到表格
-        self.cashflow_table.load_data(table_data)
+        palette = win11_theme.colors
+        
+        # 销售或支出数据变更后缓存代数会变化，此时已展示的累计值作废，需完整加载
+        manager = self.data_manager
+        manager.check_data_version()
+        generation = manager.generation
+        
+        last_range = self._last_range
+        if (last_range and generation == self._generation
+                and start_date == last_range[0] and end_date > last_range[1]):
+            # 起始日期不变、仅延长结束日期时，只查询新增区间并追加
+            cashflow_data = self._extend_cashflow(last_range[1], end_date)
+        else:
+            cashflow_data = self.data_manager.get_cash_flow_data(start_date, end_date)
+            # 转换数据格式并加载到表格
+            self.cashflow_table.load_data(self._format_rows(cashflow_data['daily_flow']))
+        
+        self._last_range = (start_date, end_date)
+        self._cashflow = cashflow_data
+        self._generation = generation
         
         # 更新摘要
-        self.total_inflow_label.config(text=f"¥{cashflow_data['total_inflow']:,.2f}")
-        self.total_outflow_label.config(text=f"¥{cashflow_data['total_outflow']:,.2f}")
+        self._set_total_inflow(text=_FMT_YUAN(cashflow_data['total_inflow']))
+        self._set_total_outflow(text=_FMT_YUAN(cashflow_data['total_outflow']))
         
-        net_color = win11_theme.colors['success'] if cashflow_data['net_cash_flow'] >= 0 else win11_theme.colors['error']
-        self.net_cashflow_label.config(
-            text=f"¥{cashflow_data['net_cash_flow']:,.2f}",
+        net_color = palette['success'] if cashflow_data['net_cash_flow'] >= 0 else palette['error']
+        self._set_net_cashflow(
+            text=_FMT_YUAN(cashflow_data['net_cash_flow']),
             foreground=net_color
         )
         
         # 绘制图表
-        if HAS_MATPLOTLIB and table_data:
+        if HAS_MATPLOTLIB and cashflow_data['daily_flow']:
             self._plot_charts(cashflow_data)
     
+    def _extend_cashflow(self, last_end: str, end_date: str) -> Dict[str, Any]:
+        """查询 (last_end, end_date] 的现金流，接续累计值追加到已有数据"""
+        previous = self._cashflow
+        delta_start = (datetime.strptime(last_end, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        delta = self.data_manager.get_cash_flow_data(delta_start, end_date)
+        
+        daily_flow = previous['daily_flow']
+        base = daily_flow[-1]['cumulative'] if daily_flow else 0.0
+        new_rows = [{**item, 'cumulative': item['cumulative'] + base} for item in delta['daily_flow']]
+        self.cashflow_table.insert_rows(self._format_rows(new_rows))
+        
+        return {
+            'daily_flow': daily_flow + new_rows,
+            'total_inflow': previous['total_inflow'] + delta['total_inflow'],
+            'total_outflow': previous['total_outflow'] + delta['total_outflow'],
+            'net_cash_flow': previous['net_cash_flow'] + delta['net_cash_flow']
+        }
+    
+    @staticmethod
+    def _format_rows(daily_flow: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """将每日现金流转换为表格行（有pandas时按列格式化）"""
+        if not HAS_PANDAS or not daily_flow:
+            return [
+                {
+                    '日期': item['date'],
+                    '现金流入': _FMT_YUAN(item['inflow']),
+                    '现金流出': _FMT_YUAN(item['outflow']),
+                    '净现金流': _FMT_YUAN(item['net_flow']),
+                    '累计现金流': _FMT_YUAN(item['cumulative'])
+                }
+                for item in daily_flow
+            ]
+        
+        df = _pandas().DataFrame.from_records(daily_flow)
+        return df.assign(
+            日期=df['date'],
+            现金流入=df['inflow'].map(_FMT_YUAN),
+            现金流出=df['outflow'].map(_FMT_YUAN),
+            净现金流=df['net_flow'].map(_FMT_YUAN),
+            累计现金流=df['cumulative'].map(_FMT_YUAN)
+        )[['日期', '现金流入', '现金流出', '净现金流', '累计现金流']].to_dict('records')
+    
     def _plot_charts(self, cashflow_data: Dict):
         """绘制图表"""
         if not cashflow_data['daily_flow']:
             return
         
-        dates = [item['date'] for item in cashflow_data['daily_flow']]
-        inflows = [item['inflow'] for item in cashflow_data['daily_flow']]
-        outflows = [item['outflow'] for item in cashflow_data['daily_flow']]
-        net_flows = [item['net_flow'] for item in cashflow_data['daily_flow']]
-        cumulative = [item['cumulative'] for item in cashflow_data['daily_flow']]
+        # 单次遍历取出绘图所需的列
+        get_columns = itemgetter('date', 'net_flow', 'cumulative')
+        dates, net_flows, cumulative = map(list, zip(*map(get_columns, cashflow_data['daily_flow'])))
         
         # 现金流趋势图
         self.trend_chart.plot_line_chart(
@@ -1082,18 +1746,20 @@ class CashFlowTab(BaseFrame):
     
     def _export_cashflow(self):
         """导出现金流表"""
-        try:
-            messagebox.showinfo("提示", "现金流表导出功能正在开发中...")
-        except Exception as e:
-            messagebox.showerror("错误", f"导出失败: {str(e)}")
+        messagebox.showinfo("提示", "现金流表导出功能正在开发中...")
 
 
 class TaxManagementTab(BaseFrame):
     """税率计算和管理标签页"""
     
+    SETTINGS_FILE = "tax_settings.json"
+    
+    # 已解析的设置文件缓存：路径 -> (修改时间, 设置)，文件未变化时不再重复解析
+    _settings_cache: Dict[str, tuple] = {}
+    
     def __init__(self, parent: tk.Widget, data_manager: FinancialDataManager, **kwargs):
         self.data_manager = data_manager
-        super().__init__(parent, **kwargs)
+        # create_widget 需要用到税率和设置，须在父类初始化之前准备好
         self.tax_rates = {
             '增值税': 0.13,
             '企业所得税': 0.25,
@@ -1102,16 +1768,27 @@ class TaxManagementTab(BaseFrame):
             '城市维护建设税': 0.07
         }
         self.tax_settings = self._load_tax_settings()
+        super().__init__(parent, **kwargs)
     
     def _load_tax_settings(self) -> Dict:
         """加载税率设置"""
         try:
-            settings_file = "tax_settings.json"
-            if os.path.exists(settings_file):
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"加载税率设置失败: {e}")
+            mtime = os.stat(self.SETTINGS_FILE).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        if mtime is not None:
+            cached = self._settings_cache.get(self.SETTINGS_FILE)
+            if cached and cached[0] == mtime:
+                return dict(cached[1])
+            
+            try:
+                with open(self.SETTINGS_FILE, 'r', encoding='utf-8') as f:
+                    settings = json.load(f)
+                self._settings_cache[self.SETTINGS_FILE] = (mtime, settings)
+                return dict(settings)
+            except Exception as e:
+                print(f"加载税率设置失败: {e}")
         
         # 默认设置
         return {
@@ -1125,10 +1802,16 @@ class TaxManagementTab(BaseFrame):
         }
     
     def _save_tax_settings(self):
-        """保存税率设置"""
+        """保存税率设置（先写临时文件再替换，避免写入中断损坏原文件）"""
+        temp_file = f"{self.SETTINGS_FILE}.tmp"
         try:
-            with open("tax_settings.json", 'w', encoding='utf-8') as f:
+            with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(self.tax_settings, f, ensure_ascii=False, indent=2)
+            os.replace(temp_file, self.SETTINGS_FILE)
+            
+            self._settings_cache[self.SETTINGS_FILE] = (
+                os.stat(self.SETTINGS_FILE).st_mtime_ns, dict(self.tax_settings)
+            )
         except Exception as e:
             print(f"保存税率设置失败: {e}")
     
@@ -1266,6 +1949,7 @@ class TaxManagementTab(BaseFrame):
                                         font=('Segoe UI', 12, 'bold'),
                                         foreground=win11_theme.colors['error'])
         self.total_tax_label.pack(side='left', padx=(10, 0))
+        self._set_total_tax = self.total_tax_label.configure
     
     def _create_declaration_tab(self, parent: ttk.Frame):
         """创建申报支持标签页"""
@@ -1345,63 +2029,48 @@ class TaxManagementTab(BaseFrame):
         if not start_date or not end_date:
             return
         
-        # 获取收入和支出数据
-        income_data = self.data_manager.get_income_data(
+        # 计税基础直接取SQL汇总的收入总额，无需取回明细
+        total_income, _, _ = self.data_manager.get_income_totals(
             start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
         )
-        
-        # 计算计税基础
-        total_income = sum(item['final_amount'] for item in income_data)
         profit = total_income * 0.7  # 假设利润率为70%
         
-        # 计算各项税费
-        tax_results = []
-        total_tax = 0
+        # 计算各项税费（企业所得税按利润计税，其余按收入计税）
+        tax_types = list(self.tax_rates)
+        rates = np.fromiter(self.tax_rates.values(), dtype=np.float64, count=len(tax_types))
+        bases = np.where([tax_type == '企业所得税' for tax_type in tax_types], profit, total_income)
+        amounts = bases * rates
+        total_tax = amounts.sum()
         
-        for tax_type, rate in self.tax_rates.items():
-            if tax_type == '增值税':
-                taxable_base = total_income
-            elif tax_type == '企业所得税':
-                taxable_base = profit
-            else:
-                taxable_base = total_income
-            
-            tax_amount = taxable_base * rate
-            total_tax += tax_amount
-            
-            tax_results.append({
+        tax_results = [
+            {
                 '税种': tax_type,
-                '计税基础': f"¥{taxable_base:,.2f}",
-                '税率': f"{rate*100:.1f}%",
-                '应纳税额': f"¥{tax_amount:,.2f}"
-            })
+                '计税基础': _FMT_YUAN(taxable_base),
+                '税率': _FMT_PCT(rate*100),
+                '应纳税额': _FMT_YUAN(tax_amount)
+            }
+            for tax_type, taxable_base, rate, tax_amount in zip(
+                tax_types, bases.tolist(), rates.tolist(), amounts.tolist()
+            )
+        ]
         
         # 更新表格
         self.tax_table.load_data(tax_results)
         
         # 更新总税额
-        self.total_tax_label.config(text=f"¥{total_tax:,.2f}")
+        self._set_total_tax(text=_FMT_YUAN(total_tax))
     
     def _generate_vat_declaration(self):
         """生成增值税申报表"""
-        try:
-            messagebox.showinfo("提示", "增值税申报表生成功能正在开发中...")
-        except Exception as e:
-            messagebox.showerror("错误", f"生成失败: {str(e)}")
+        messagebox.showinfo("提示", "增值税申报表生成功能正在开发中...")
     
     def _generate_income_tax_declaration(self):
         """生成所得税申报表"""
-        try:
-            messagebox.showinfo("提示", "所得税申报表生成功能正在开发中...")
-        except Exception as e:
-            messagebox.showerror("错误", f"生成失败: {str(e)}")
+        messagebox.showinfo("提示", "所得税申报表生成功能正在开发中...")
     
     def _generate_tax_declaration(self):
         """生成税务申报表"""
-        try:
-            messagebox.showinfo("提示", "税务申报表生成功能正在开发中...")
-        except Exception as e:
-            messagebox.showerror("错误", f"生成失败: {str(e)}")
+        messagebox.showinfo("提示", "税务申报表生成功能正在开发中...")
     
     def _open_document(self):
         """打开文档"""
@@ -1446,8 +2115,15 @@ class TaxManagementTab(BaseFrame):
 class FinancialSummaryTab(BaseFrame):
     """自动财务摘要标签页"""
     
+    # 后台保存结果的轮询间隔（毫秒）
+    POLL_INTERVAL = 50
+    # 所有摘要页共享的文件写入线程池
+    _io_pool = ThreadPoolExecutor(max_workers=2)
+    
     def __init__(self, parent: tk.Widget, data_manager: FinancialDataManager, **kwargs):
         self.data_manager = data_manager
+        # 最近一次生成的摘要文本（文本框只读，复制/保存直接使用）
+        self._last_summary = ""
         super().__init__(parent, **kwargs)
     
     def create_widget(self):
@@ -1528,6 +2204,7 @@ class FinancialSummaryTab(BaseFrame):
     
     def _create_kpi_grid(self, parent: ttk.Frame):
         """创建KPI网格"""
+        palette = win11_theme.colors
         # KPI数据
         kpi_data = [
             ('总收入', '¥0.00', 'success'),
@@ -1538,6 +2215,9 @@ class FinancialSummaryTab(BaseFrame):
             ('平均订单', '¥0.00', 'warning')
         ]
         
+        # KPI名称 -> 数值标签
+        self.kpi_labels: Dict[str, ttk.Label] = {}
+        
         # 创建2x3网格
         for i, (label, initial_value, color) in enumerate(kpi_data):
             row = i // 3
@@ -1552,11 +2232,11 @@ class FinancialSummaryTab(BaseFrame):
             
             kpi_label = ttk.Label(kpi_card, text=initial_value, 
                                  font=('Segoe UI', 14, 'bold'),
-                                 foreground=win11_theme.colors[color])
+                                 foreground=palette[color])
             kpi_label.pack()
             
             # 保存引用以便更新
-            setattr(self, f'{label.replace(" ", "_")}_label', kpi_label)
+            self.kpi_labels[label] = kpi_label
         
         # 配置网格权重
         for i in range(2):
@@ -1570,8 +2250,8 @@ class FinancialSummaryTab(BaseFrame):
     
     def _load_summary_data(self, start_date: str, end_date: str):
         """加载摘要数据"""
-        # 获取分析数据
-        analysis_data = self.data_manager.get_profit_analysis(start_date, end_date)
+        # 获取分析数据（摘要不需要按月明细）
+        analysis_data = self.data_manager.get_profit_totals(start_date, end_date)
         
         # 更新KPI
         total_income = analysis_data['total_income']
@@ -1581,19 +2261,28 @@ class FinancialSummaryTab(BaseFrame):
         order_count = analysis_data['income_count']
         avg_order = total_income / order_count if order_count > 0 else 0
         
+        # 金额只格式化一次，KPI标签和摘要文本共用
+        formatted = {
+            'total_income': _FMT_YUAN(total_income),
+            'total_expense': _FMT_YUAN(total_expense),
+            'net_profit': _FMT_YUAN(net_profit),
+            'profit_margin': _FMT_PCT(profit_margin)
+        }
+        
         # 更新标签
-        self.总收入_label.config(text=f"¥{total_income:,.2f}")
-        self.总支出_label.config(text=f"¥{total_expense:,.2f}")
-        self.净利润_label.config(text=f"¥{net_profit:,.2f}")
-        self.利润率_label.config(text=f"{profit_margin:.1f}%")
-        self.订单数量_label.config(text=str(order_count))
-        self.平均订单_label.config(text=f"¥{avg_order:.2f}")
+        kpi_labels = self.kpi_labels
+        kpi_labels['总收入'].config(text=formatted['total_income'])
+        kpi_labels['总支出'].config(text=formatted['total_expense'])
+        kpi_labels['净利润'].config(text=formatted['net_profit'])
+        kpi_labels['利润率'].config(text=formatted['profit_margin'])
+        kpi_labels['订单数量'].config(text=str(order_count))
+        kpi_labels['平均订单'].config(text=f"¥{avg_order:.2f}")
         
         # 生成摘要文本
-        self._generate_summary_text(analysis_data)
+        self._generate_summary_text(analysis_data, formatted)
     
-    def _generate_summary_text(self, analysis_data: Dict):
-        """生成摘要文本"""
+    def _generate_summary_text(self, analysis_data: Dict, formatted: Dict[str, str]):
+        """生成摘要文本（formatted 为已格式化的金额和利润率）"""
         total_income = analysis_data['total_income']
         total_expense = analysis_data['total_expense']
         net_profit = analysis_data['net_profit']
@@ -1601,54 +2290,56 @@ class FinancialSummaryTab(BaseFrame):
         order_count = analysis_data['income_count']
         expense_count = analysis_data['expense_count']
         
-        # 生成摘要
-        summary = f"""
-# 财务摘要报告
-
-## 总体情况
-- **报告期间**: {self.summary_date_selector.start_date} 至 {self.summary_date_selector.end_date}
-- **总收入**: ¥{total_income:,.2f}
-- **总支出**: ¥{total_expense:,.2f}
-- **净利润**: ¥{net_profit:,.2f}
-- **利润率**: {profit_margin:.1f}%
-
-## 经营分析
-- **收入笔数**: {order_count}笔
-- **支出笔数**: {expense_count}笔
-- **收支比**: 1:{total_expense/total_income:.2f} (当收入>0时)
-
-## 盈利能力评估
-"""
+        # 收入为0时不计算收支比，避免除零
+        if total_income > 0:
+            ratio_line = f"1:{total_expense / total_income:.2f}"
+        else:
+            ratio_line = "无收入，无法计算"
+        
+        # 生成摘要（分段收集后一次拼接）
+        parts = [_SUMMARY_TEMPLATE.format_map({
+            **formatted,
+            'start': self.summary_date_selector.start_date,
+            'end': self.summary_date_selector.end_date,
+            'order_count': order_count,
+            'expense_count': expense_count,
+            'ratio_line': ratio_line
+        })]
+        append = parts.append
         
         if net_profit > 0:
-            summary += f"- ✅ **盈利状况**: 良好，净利润¥{net_profit:,.2f}\n"
+            append(f"- ✅ **盈利状况**: 良好，净利润{formatted['net_profit']}\n")
             if profit_margin > 20:
-                summary += "- ✅ **利润率水平**: 优秀，超过20%\n"
+                append("- ✅ **利润率水平**: 优秀，超过20%\n")
             elif profit_margin > 10:
-                summary += "- ✅ **利润率水平**: 良好，10%-20%\n"
+                append("- ✅ **利润率水平**: 良好，10%-20%\n")
             else:
-                summary += "- ⚠️ **利润率水平**: 一般，低于10%\n"
+                append("- ⚠️ **利润率水平**: 一般，低于10%\n")
         else:
-            summary += f"- ❌ **盈利状况**: 亏损，净亏损¥{abs(net_profit):,.2f}\n"
-            summary += "- ⚠️ **建议**: 需要控制成本或增加收入\n"
+            # 取绝对值，收支持平时不会显示为 -0.00
+            loss = abs(net_profit)
+            append(f"- ❌ **盈利状况**: 亏损，净亏损¥{loss:,.2f}\n")
+            append("- ⚠️ **建议**: 需要控制成本或增加收入\n")
         
-        summary += f"""
-## 经营建议
-"""
+        append("\n## 经营建议\n")
         if profit_margin > 15:
-            summary += "- 当前经营状况良好，可考虑扩大业务规模\n"
+            append("- 当前经营状况良好，可考虑扩大业务规模\n")
         elif profit_margin > 5:
-            summary += "- 经营状况一般，建议优化成本结构\n"
+            append("- 经营状况一般，建议优化成本结构\n")
         else:
-            summary += "- 需要重点关注成本控制和收入提升\n"
+            append("- 需要重点关注成本控制和收入提升\n")
         
         if order_count > 0:
             avg_daily_orders = order_count / 30  # 假设30天
-            summary += f"- 平均每日订单量: {avg_daily_orders:.1f}笔\n"
+            append(f"- 平均每日订单量: {avg_daily_orders:.1f}笔\n")
+        
+        summary = self._last_summary = "".join(parts)
         
-        # 更新文本框
+        # 更新文本框（整段一次写入，写入后保持只读）
+        self.summary_text.configure(state='normal')
         self.summary_text.delete(1.0, tk.END)
         self.summary_text.insert(1.0, summary)
+        self.summary_text.configure(state='disabled')
     
     def _generate_summary(self):
         """生成摘要"""
@@ -1661,32 +2352,42 @@ class FinancialSummaryTab(BaseFrame):
     
     def _copy_summary(self):
         """复制摘要"""
-        summary_text = self.summary_text.get(1.0, tk.END)
         self.main_frame.clipboard_clear()
-        self.main_frame.clipboard_append(summary_text)
+        self.main_frame.clipboard_append(self._last_summary)
         messagebox.showinfo("成功", "摘要已复制到剪贴板")
     
     def _save_summary(self):
-        """保存摘要"""
+        """保存摘要（文件写入在后台线程执行）"""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("文本文件", "*.txt"), ("所有文件", "*.*")]
+        )
+        if filename:
+            future = self._io_pool.submit(self._write_file, filename, self._last_summary)
+            self.main_frame.after(self.POLL_INTERVAL, self._poll_save, future, filename)
+    
+    @staticmethod
+    def _write_file(filename: str, text: str):
+        """写入文本文件"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(text)
+    
+    def _poll_save(self, future, filename: str):
+        """检查后台保存是否完成；提示框只能在主线程中弹出"""
+        if not future.done():
+            self.main_frame.after(self.POLL_INTERVAL, self._poll_save, future, filename)
+            return
+        
         try:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".txt",
-                filetypes=[("文本文件", "*.txt"), ("所有文件", "*.*")]
-            )
-            if filename:
-                summary_text = self.summary_text.get(1.0, tk.END)
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(summary_text)
-                messagebox.showinfo("成功", f"摘要已保存到 {filename}")
+            future.result()
         except Exception as e:
             messagebox.showerror("错误", f"保存失败: {str(e)}")
+            return
+        messagebox.showinfo("成功", f"摘要已保存到 {filename}")
     
     def _export_pdf(self):
         """导出PDF"""
-        try:
-            messagebox.showinfo("提示", "PDF导出功能正在开发中...")
-        except Exception as e:
-            messagebox.showerror("错误", f"导出失败: {str(e)}")
+        messagebox.showinfo("提示", "PDF导出功能正在开发中...")
 
 
 class FinancialReportsGUI(BaseFrame):
@@ -1722,48 +2423,51 @@ class FinancialReportsGUI(BaseFrame):
         # 应用主题
         self._apply_theme()
     
+    # 标签页定义：(属性名, 标签文字, 标签页类)
+    TAB_SPECS = (
+        ('income_tab', "📈 收入报表", IncomeStatementTab),
+        ('expense_tab', "📊 支出报表", ExpenseStatementTab),
+        ('profit_tab', "💰 利润分析", ProfitAnalysisTab),
+        ('cashflow_tab', "💵 现金流", CashFlowTab),
+        ('tax_tab', "🧮 税费管理", TaxManagementTab),
+        ('summary_tab', "📋 自动摘要", FinancialSummaryTab),
+    )
+    
     def _create_tabs(self):
-        """创建标签页"""
-        # 收入报表
-        income_frame = ttk.Frame(self.notebook)
-        self.notebook.add(income_frame, text="📈 收入报表")
-        self.income_tab = IncomeStatementTab(income_frame, self.data_manager)
-        self.income_tab.pack(fill='both', expand=True)
-        
-        # 支出报表
-        expense_frame = ttk.Frame(self.notebook)
-        self.notebook.add(expense_frame, text="📊 支出报表")
-        self.expense_tab = ExpenseStatementTab(expense_frame, self.data_manager)
-        self.expense_tab.pack(fill='both', expand=True)
-        
-        # 利润分析
-        profit_frame = ttk.Frame(self.notebook)
-        self.notebook.add(profit_frame, text="💰 利润分析")
-        self.profit_tab = ProfitAnalysisTab(profit_frame, self.data_manager)
-        self.profit_tab.pack(fill='both', expand=True)
-        
-        # 现金流
-        cashflow_frame = ttk.Frame(self.notebook)
-        self.notebook.add(cashflow_frame, text="💵 现金流")
-        self.cashflow_tab = CashFlowTab(cashflow_frame, self.data_manager)
-        self.cashflow_tab.pack(fill='both', expand=True)
-        
-        # 税费管理
-        tax_frame = ttk.Frame(self.notebook)
-        self.notebook.add(tax_frame, text="🧮 税费管理")
-        self.tax_tab = TaxManagementTab(tax_frame, self.data_manager)
-        self.tax_tab.pack(fill='both', expand=True)
-        
-        # 自动摘要
-        summary_frame = ttk.Frame(self.notebook)
-        self.notebook.add(summary_frame, text="📋 自动摘要")
-        self.summary_tab = FinancialSummaryTab(summary_frame, self.data_manager)
-        self.summary_tab.pack(fill='both', expand=True)
+        """创建标签页（仅创建容器，内容在首次切换到该页时再构建）"""
+        self._tab_frames: List[ttk.Frame] = []
+        for attr, text, _ in self.TAB_SPECS:
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=text)
+            self._tab_frames.append(frame)
+            setattr(self, attr, None)
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        # 立即构建当前显示的标签页
+        self._on_tab_changed()
+    
+    def _on_tab_changed(self, event=None):
+        """切换标签页时按需构建其内容"""
+        index = self.notebook.index('current')
+        attr, _, tab_class = self.TAB_SPECS[index]
+        if getattr(self, attr) is None:
+            tab = tab_class(self._tab_frames[index], self.data_manager)
+            tab.pack(fill='both', expand=True)
+            setattr(self, attr, tab)
     
     def _apply_theme(self):
         """应用Win11主题"""
         # 这里可以应用特定的财务报表主题样式
         pass
+    
+    def destroy(self):
+        """销毁界面并释放数据库连接"""
+        for attr, _, _ in self.TAB_SPECS:
+            tab = getattr(self, attr, None)
+            if tab is not None:
+                tab.destroy()
+        self.data_manager.close()
+        super().destroy()
 
 
 # 测试和演示功能
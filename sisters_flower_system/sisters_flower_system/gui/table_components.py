@@ -4,8 +4,11 @@
 """
 
 import tkinter as tk
+from operator import itemgetter
 from tkinter import ttk
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Iterable, Optional
+
+import numpy as np
 
 from .base_components import BaseFrame
 
@@ -13,23 +16,49 @@ from .base_components import BaseFrame
 try:
     from ..utils.gui_utils import make_table
 except ImportError:
-    # 处理相对导入问题
-    import sys
+    # 非包方式运行时，将包根目录加入搜索路径（仅添加一次）
     import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import sys
+    _PKG_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _PKG_ROOT not in sys.path:
+        sys.path.insert(0, _PKG_ROOT)
     from utils.gui_utils import make_table
 
 
+# 行ID字符串池：各表格重复加载时复用同一批字符串对象
+_IID_POOL: List[str] = []
+
+
+def _item_ids(start: int, stop: int) -> List[str]:
+    """返回 [start, stop) 区间对应的行ID"""
+    if stop > len(_IID_POOL):
+        _IID_POOL.extend(map(str, range(len(_IID_POOL), stop)))
+    return _IID_POOL[start:stop]
+
+
 class ScrollableTable(BaseFrame):
     """可滚动的表格组件"""
     
+    # 选择事件防抖间隔（毫秒），连续切换选中行时只回调一次
+    SELECT_DEBOUNCE_MS = 50
+    
     def __init__(self, parent: tk.Widget, columns: List[str], 
                  data: List[Dict[str, Any]] = None, **kwargs):
         self.columns = columns
         self.data = data or []
         self.data_map: Dict[str, Dict[str, Any]] = {}  # 存储原始数据
+        # 按列顺序取值（C实现），缺列时回退到逐列 get
+        if len(columns) == 1:
+            column = columns[0]
+            self._values_getter = lambda row: (row[column],)
+        else:
+            self._values_getter = itemgetter(*columns)
+        # 按列存储的值（列名 -> 值列表，与 _store_ids 一一对应），按需构建，数据变化时清空
+        self._column_store: Dict[str, List[Any]] = {}
+        self._store_ids: List[str] = []
         self.selected_callback: Optional[Callable] = None
         self.double_click_callback: Optional[Callable] = None
+        self._select_after_id = None
         super().__init__(parent, **kwargs)
     
     def create_widget(self):
@@ -53,38 +82,74 @@ class ScrollableTable(BaseFrame):
     
     def load_data(self, data: List[Dict[str, Any]]):
         """加载数据"""
-        # 清空现有数据
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # 清空现有数据（一次调用删除全部行）
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
         
         self.data_map.clear()
         
         # 添加新数据
-        for i, row_data in enumerate(data):
-            item_id = str(i)
-            values = tuple(row_data.get(col, '') for col in self.columns)
-            self.tree.insert('', 'end', iid=item_id, values=values)
-            self.data_map[item_id] = row_data
+        self.insert_rows(data)
+    
+    def insert_rows(self, data: List[Dict[str, Any]]):
+        """在末尾追加多行（保留现有数据）"""
+        # 先统一生成行ID，再逐行插入，最后一次性更新数据映射
+        columns = self.columns
+        item_ids = _item_ids(len(self.data_map), len(self.data_map) + len(data))
+        insert = self.tree.insert
+        get_values = self._values_getter
+        for item_id, row_data in zip(item_ids, data):
+            try:
+                values = get_values(row_data)
+            except KeyError:
+                values = tuple(row_data.get(col, '') for col in columns)
+            insert('', 'end', iid=item_id, values=values)
+        self.data_map.update(zip(item_ids, data))
+        self._on_data_changed()
     
     def add_row(self, data: Dict[str, Any]):
         """添加行"""
-        item_id = str(len(self.data_map))
-        values = tuple(data.get(col, '') for col in self.columns)
-        self.tree.insert('', 'end', iid=item_id, values=values)
+        item_id = _item_ids(len(self.data_map), len(self.data_map) + 1)[0]
+        self.tree.insert('', 'end', iid=item_id, values=self._row_values(data))
         self.data_map[item_id] = data
+        self._on_data_changed()
     
     def remove_row(self, item_id: str):
         """删除行"""
         if item_id in self.data_map:
             self.tree.delete(item_id)
             del self.data_map[item_id]
+            self._on_data_changed()
     
     def update_row(self, item_id: str, data: Dict[str, Any]):
         """更新行"""
         if item_id in self.data_map:
-            values = tuple(data.get(col, '') for col in self.columns)
-            self.tree.item(item_id, values=values)
+            self.tree.item(item_id, values=self._row_values(data))
             self.data_map[item_id] = data
+            self._on_data_changed()
+    
+    def _column_values(self, column: str) -> List[Any]:
+        """获取某列的全部值（与 self._store_ids 顺序一致）"""
+        store = self._column_store
+        if not store:
+            self._store_ids = list(self.data_map)
+        values = store.get(column)
+        if values is None:
+            data_map = self.data_map
+            values = store[column] = [data_map[item_id].get(column, '') for item_id in self._store_ids]
+        return values
+    
+    def _on_data_changed(self):
+        """数据变化后的钩子（子类重写时需调用父类实现）"""
+        self._column_store.clear()
+    
+    def _row_values(self, row_data: Dict[str, Any]) -> tuple:
+        """按列顺序取出一行的显示值，缺失的列显示为空"""
+        try:
+            return self._values_getter(row_data)
+        except KeyError:
+            return tuple(row_data.get(col, '') for col in self.columns)
     
     def get_selected_data(self) -> Optional[Dict[str, Any]]:
         """获取选中行的数据"""
@@ -94,8 +159,12 @@ class ScrollableTable(BaseFrame):
             return self.data_map.get(item_id)
         return None
     
-    def get_all_data(self) -> List[Dict[str, Any]]:
-        """获取所有数据"""
+    def get_all_data(self) -> Iterable[Dict[str, Any]]:
+        """获取所有数据（实时视图，仅需遍历时无需复制）"""
+        return self.data_map.values()
+    
+    def get_all_data_copy(self) -> List[Dict[str, Any]]:
+        """获取所有数据的列表副本"""
         return list(self.data_map.values())
     
     def set_selected_callback(self, callback: Callable):
@@ -107,7 +176,15 @@ class ScrollableTable(BaseFrame):
         self.double_click_callback = callback
     
     def _on_select(self, event):
-        """选择事件处理"""
+        """选择事件处理（防抖）"""
+        if self.selected_callback:
+            if self._select_after_id:
+                self.tree.after_cancel(self._select_after_id)
+            self._select_after_id = self.tree.after(self.SELECT_DEBOUNCE_MS, self._fire_select)
+    
+    def _fire_select(self):
+        """防抖结束后回调当前选中行"""
+        self._select_after_id = None
         if self.selected_callback:
             data = self.get_selected_data()
             if data:
@@ -115,10 +192,21 @@ class ScrollableTable(BaseFrame):
     
     def _on_double_click(self, event):
         """双击事件处理"""
+        if self._select_after_id:
+            # 双击前的选择回调立即执行，保证回调顺序不变
+            self.tree.after_cancel(self._select_after_id)
+            self._fire_select()
         if self.double_click_callback:
             data = self.get_selected_data()
             if data:
                 self.double_click_callback(data)
+    
+    def destroy(self):
+        """销毁组件并取消未执行的选择回调"""
+        if self._select_after_id:
+            self.tree.after_cancel(self._select_after_id)
+            self._select_after_id = None
+        super().destroy()
 
 
 class PaginatedTable(BaseFrame):
@@ -227,6 +315,9 @@ class PaginatedTable(BaseFrame):
         """跳转到指定页"""
         try:
             page = int(self.page_entry.get())
+            if page == self.current_page:
+                # 仍是当前页，无需重新加载
+                return
             if 1 <= page <= self.total_pages:
                 self.current_page = page
                 self._update_page()
@@ -245,9 +336,16 @@ class PaginatedTable(BaseFrame):
 class SortableTable(ScrollableTable):
     """可排序表格组件"""
     
+    # 文本列重新判断是否变为数值列时抽查的值个数
+    KIND_SAMPLE_SIZE = 16
+    
     def __init__(self, parent: tk.Widget, columns: List[str], **kwargs):
         self.sort_column = None
         self.sort_reverse = False
+        # (列名, 是否降序) -> 排好序的行ID，数据变化时失效
+        self._sort_cache: Dict[tuple, List[str]] = {}
+        # 列名 -> 列类型（float 或 str），跨数据加载保留
+        self._column_kinds: Dict[str, type] = {}
         super().__init__(parent, columns, **kwargs)
     
     def create_widget(self):
@@ -265,24 +363,65 @@ class SortableTable(ScrollableTable):
             self.sort_column = column
             self.sort_reverse = False
         
-        # 排序数据
-        sorted_data = sorted(
-            list(self.data_map.values()),
-            key=lambda x: self._get_sort_key(x.get(column, '')),
-            reverse=self.sort_reverse
-        )
+        # 行ID在排序过程中保持不变，已排过的列和方向直接复用结果
+        cache_key = (column, self.sort_reverse)
+        ordered = self._sort_cache.get(cache_key)
+        if ordered is None:
+            ordered = self._sort_cache[cache_key] = self._sorted_item_ids(column, self.sort_reverse)
         
-        # 重新加载数据
-        self.load_data(sorted_data)
+        # 原地移动表格行
+        self._reload_from_order(ordered)
     
-    def _get_sort_key(self, value) -> Any:
-        """获取排序键"""
-        if isinstance(value, (int, float)):
-            return value
-        try:
-            return float(value)
-        except (ValueError, TypeError):
+    def _sorted_item_ids(self, column: str, reverse: bool = False) -> List[str]:
+        """返回按指定列稳定排序的行ID（reverse 为 True 时降序，相等值保持原有顺序）"""
+        values = self._column_values(column)
+        item_ids = self._store_ids
+        
+        # 数值列使用numpy排序；已知为文本的列（抽样仍非数值时）跳过数值转换
+        kinds = self._column_kinds
+        if kinds.get(column) is not str or self._is_numeric(values[:self.KIND_SAMPLE_SIZE]):
             try:
-                return int(value)
+                array = np.asarray(values, dtype=np.float64)
+                order = np.argsort(-array if reverse else array, kind='stable')
+                kinds[column] = float
+                return [item_ids[i] for i in order]
             except (ValueError, TypeError):
-                return str(value).lower()
+                kinds[column] = str
+        
+        # 混合列（如含空白单元格的数值列）：数值在前按大小排序，其余按文本排序
+        keys = [self._mixed_sort_key(value) for value in values]
+        order = sorted(range(len(item_ids)), key=keys.__getitem__, reverse=reverse)
+        return [item_ids[i] for i in order]
+    
+    def _reload_from_order(self, item_ids: List[str]):
+        """按给定行ID顺序原地移动表格行"""
+        move = self.tree.move
+        for index, item_id in enumerate(item_ids):
+            move(item_id, '', index)
+        # 原地重排数据映射，已取得的 get_all_data 视图保持有效
+        data_map = self.data_map
+        ordered = [(item_id, data_map[item_id]) for item_id in item_ids]
+        data_map.clear()
+        data_map.update(ordered)
+    
+    def _on_data_changed(self):
+        """数据变化后清空排序缓存"""
+        super()._on_data_changed()
+        self._sort_cache.clear()
+    
+    @staticmethod
+    def _mixed_sort_key(value: Any) -> tuple:
+        """可转换为数值的值返回 (0, 数值)，否则返回 (1, 小写文本)"""
+        try:
+            return (0, float(value))
+        except (ValueError, TypeError):
+            return (1, str(value).lower())
+    
+    @staticmethod
+    def _is_numeric(values: List[Any]) -> bool:
+        """判断给定的值是否均可转换为数值"""
+        try:
+            np.asarray(values, dtype=np.float64)
+        except (ValueError, TypeError):
+            return False
+        return True
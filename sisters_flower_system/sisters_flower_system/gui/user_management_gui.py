@@ -4,23 +4,86 @@
 提供完整的用户管理功能，包括用户CRUD、权限管理、活动日志等
 """
 
-import os
-import sys
 import tkinter as tk
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import date, datetime, timedelta
 from tkinter import ttk, messagebox
+from types import MappingProxyType
 from typing import List, Dict, Any
 
-# 添加项目根目录到路径
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from .base_components import BaseFrame, BaseDialog
-from ..config.win11_theme import win11_theme
+
+
+# 用户角色选项：(显示文字, 值)
+_ROLE_CHOICES = (
+    ("普通用户", "user"),
+    ("管理员", "admin"),
+    ("经理", "manager"),
+    ("财务", "accountant"),
+    ("销售", "sales")
+)
+
+# 账户状态选项：(显示文字, 值)
+_STATUS_CHOICES = (
+    ("活跃", "active"),
+    ("禁用", "disabled"),
+    ("待审核", "pending")
+)
+
+# 状态值 -> 显示文字，及其反向映射（筛选下拉框使用）
+_STATUS_TEXT = MappingProxyType({value: text for text, value in _STATUS_CHOICES})
+_STATUS_VALUE = MappingProxyType({text: value for text, value in _STATUS_CHOICES})
+
+# 用户表单中的权限选项：(显示文字, 权限标识)
+_PERMISSION_OPTIONS = (
+    ("用户管理", "user_management"),
+    ("订单管理", "order_management"),
+    ("库存管理", "inventory_management"),
+    ("财务管理", "financial_management"),
+    ("报表查看", "report_view"),
+    ("系统设置", "system_settings"),
+    ("数据导入导出", "data_import_export"),
+    ("会员管理", "member_management")
+)
+
+# 权限管理树数据：模块 -> 权限标识 -> 各操作是否允许
+_PERMISSIONS_DATA = MappingProxyType({
+    "用户管理": {
+        "view_users": {"read": True, "write": False, "delete": False, "admin": False},
+        "edit_users": {"read": True, "write": True, "delete": False, "admin": False},
+        "manage_users": {"read": True, "write": True, "delete": True, "admin": True}
+    },
+    "订单管理": {
+        "view_orders": {"read": True, "write": False, "delete": False, "admin": False},
+        "edit_orders": {"read": True, "write": True, "delete": False, "admin": False},
+        "manage_orders": {"read": True, "write": True, "delete": True, "admin": True}
+    },
+    "库存管理": {
+        "view_inventory": {"read": True, "write": False, "delete": False, "admin": False},
+        "edit_inventory": {"read": True, "write": True, "delete": False, "admin": False},
+        "manage_inventory": {"read": True, "write": True, "delete": True, "admin": True}
+    },
+    "财务管理": {
+        "view_finance": {"read": True, "write": False, "delete": False, "admin": False},
+        "edit_finance": {"read": True, "write": True, "delete": False, "admin": False},
+        "manage_finance": {"read": True, "write": True, "delete": True, "admin": True}
+    }
+})
+
+# 权限标识 -> 树中显示的名称（加载模块时一次性生成）
+_PERM_DISPLAY = MappingProxyType({
+    perm_name: perm_name.replace("_", " ").title()
+    for module_permissions in _PERMISSIONS_DATA.values()
+    for perm_name in module_permissions
+})
 
 
 class User:
     """用户数据模型"""
     
+    __slots__ = ('user_id', 'username', 'email', 'role', 'status', 'created_at',
+                 'last_login', '_permissions', '_perm_set', 'phone', 'department')
+    
     def __init__(self, user_id: int, username: str, email: str, role: str = "user", 
                  status: str = "active", created_at: str = None, last_login: str = None,
                  permissions: List[str] = None, phone: str = "", department: str = ""):
@@ -29,7 +92,7 @@ class User:
         self.email = email
         self.role = role
         self.status = status
-        self.created_at = created_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.created_at = created_at or datetime.now().isoformat(sep=' ', timespec='seconds')
         self.last_login = last_login
         self.permissions = permissions or []
         self.phone = phone
@@ -50,6 +113,23 @@ class User:
             'department': self.department
         }
     
+    @property
+    def permissions(self) -> List[str]:
+        """权限列表"""
+        return self._permissions
+    
+    @permissions.setter
+    def permissions(self, value: List[str]):
+        self._permissions = value
+        self._perm_set = None
+    
+    @property
+    def permissions_set(self) -> frozenset:
+        """权限集合（用于成员判断，按需构建，重新赋值权限列表后失效）"""
+        if self._perm_set is None:
+            self._perm_set = frozenset(self._permissions)
+        return self._perm_set
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'User':
         """从字典创建用户"""
@@ -59,13 +139,15 @@ class User:
 class ActivityLog:
     """活动日志数据模型"""
     
+    __slots__ = ('log_id', 'user_id', 'action', 'details', 'timestamp', 'ip_address')
+    
     def __init__(self, log_id: int, user_id: int, action: str, details: str, 
                  timestamp: str = None, ip_address: str = ""):
         self.log_id = log_id
         self.user_id = user_id
         self.action = action
         self.details = details
-        self.timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.timestamp = timestamp or datetime.now().isoformat(sep=' ', timespec='seconds')
         self.ip_address = ip_address
     
     def to_dict(self) -> Dict[str, Any]:
@@ -79,6 +161,67 @@ class ActivityLog:
         }
 
 
+def _parse_date(text: str) -> str:
+    """将输入的日期解析并规范为 YYYY-MM-DD（空字符串表示不限），格式错误时抛出 ValueError"""
+    if not text:
+        return ""
+    return datetime.strptime(text, "%Y-%m-%d").date().isoformat()
+
+
+def _filter_logs(logs, start_date: str, end_date: str, user_id: int = None) -> tuple:
+    """按日期范围和用户筛选日志"""
+    return tuple(
+        log for log in logs
+        if (user_id is None or log.user_id == user_id)
+        and (not start_date or log.timestamp[:10] >= start_date)
+        and (not end_date or log.timestamp[:10] <= end_date)
+    )
+
+
+def _scroll_canvas(event):
+    """鼠标滚轮滚动画布（Windows/macOS 使用 delta，Linux 为 Button-4/5）"""
+    if event.num == 4:
+        step = -1
+    elif event.num == 5:
+        step = 1
+    else:
+        step = -event.delta // 120
+    event.widget.yview_scroll(step, "units")
+
+
+def _setup_columns(tree: ttk.Treeview, specs):
+    """按 (列标识, 标题, 宽度) 规格配置表格列，每列一次 heading 和一次 column 调用
+
+    宽度为 None 时保留 Tk 默认列宽，省去 column 调用。
+    """
+    heading = tree.heading
+    column = tree.column
+    for col, text, width in specs:
+        heading(col, text=text)
+        if width is not None:
+            column(col, width=width)
+
+
+# 对话框命名样式：(样式名, 配置项)
+_FORM_STYLES = (
+    ('FormTitle.TLabel', {'font': ('Segoe UI', 16, 'bold')}),
+    ('FormSubtitle.TLabel', {'font': ('Segoe UI', 12, 'bold')}),
+    ('Form.TLabel', {'font': ('Segoe UI', 10, 'bold')}),
+    ('FormHint.TLabel', {'font': ('Segoe UI', 8), 'foreground': 'gray'}),
+)
+
+
+def _init_styles(root: tk.Misc):
+    """为窗口注册对话框命名样式（每个 Tk 解释器只配置一次）"""
+    # 每个对话框都是独立的 Tk 实例，样式随解释器存在，因此按窗口记录是否已配置
+    if getattr(root, '_form_styles_ready', False):
+        return
+    style = ttk.Style(root)
+    for name, options in _FORM_STYLES:
+        style.configure(name, **options)
+    root._form_styles_ready = True
+
+
 class UserFormDialog(BaseDialog):
     """用户表单对话框"""
     
@@ -92,13 +235,15 @@ class UserFormDialog(BaseDialog):
     
     def create_widget(self):
         """创建表单组件"""
+        _init_styles(self.root)
+        
         # 主容器
         main_frame = ttk.Frame(self.root, padding="20")
         main_frame.pack(fill='both', expand=True)
         
         # 标题
         title = "创建新用户" if not self.user else "编辑用户"
-        title_label = ttk.Label(main_frame, text=title, font=('Segoe UI', 16, 'bold'))
+        title_label = ttk.Label(main_frame, text=title, style='FormTitle.TLabel')
         title_label.pack(pady=(0, 20))
         
         # 创建滚动框架
@@ -143,9 +288,8 @@ class UserFormDialog(BaseDialog):
         scrollbar.pack(side="right", fill="y")
         
         # 绑定鼠标滚轮
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind("<MouseWheel>", _on_mousewheel)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            canvas.bind(sequence, _scroll_canvas)
     
     def _create_form_fields(self, parent):
         """创建表单字段"""
@@ -184,7 +328,7 @@ class UserFormDialog(BaseDialog):
                      placeholder: str, entry_type: str = "text"):
         """创建输入字段"""
         # 标签
-        label = ttk.Label(parent, text=label_text, font=('Segoe UI', 10, 'bold'))
+        label = ttk.Label(parent, text=label_text, style='Form.TLabel')
         label.pack(anchor='w', pady=(15, 5))
         
         # 输入框
@@ -196,16 +340,15 @@ class UserFormDialog(BaseDialog):
         
         # 提示文字
         if placeholder:
-            hint_label = ttk.Label(parent, text=placeholder, font=('Segoe UI', 8))
+            hint_label = ttk.Label(parent, text=placeholder, style='FormHint.TLabel')
             hint_label.pack(anchor='w', pady=(0, 10))
-            hint_label.configure(foreground='gray')
         
         self.entries[field_name] = entry
     
     def _create_role_field(self, parent):
         """创建角色选择字段"""
         # 标签
-        label = ttk.Label(parent, text="用户角色", font=('Segoe UI', 10, 'bold'))
+        label = ttk.Label(parent, text="用户角色", style='Form.TLabel')
         label.pack(anchor='w', pady=(15, 5))
         
         # 角色选择
@@ -213,22 +356,14 @@ class UserFormDialog(BaseDialog):
         role_frame.pack(fill='x', pady=(0, 5))
         
         self.role_var = tk.StringVar(value="user")
-        roles = [
-            ("普通用户", "user"),
-            ("管理员", "admin"),
-            ("经理", "manager"),
-            ("财务", "accountant"),
-            ("销售", "sales")
-        ]
-        
-        for text, value in roles:
+        for text, value in _ROLE_CHOICES:
             rb = ttk.Radiobutton(role_frame, text=text, variable=self.role_var, value=value)
             rb.pack(anchor='w', pady=2)
     
     def _create_status_field(self, parent):
         """创建状态选择字段"""
         # 标签
-        label = ttk.Label(parent, text="账户状态", font=('Segoe UI', 10, 'bold'))
+        label = ttk.Label(parent, text="账户状态", style='Form.TLabel')
         label.pack(anchor='w', pady=(15, 5))
         
         # 状态选择
@@ -236,40 +371,22 @@ class UserFormDialog(BaseDialog):
         status_frame.pack(fill='x', pady=(0, 5))
         
         self.status_var = tk.StringVar(value="active")
-        statuses = [
-            ("活跃", "active"),
-            ("禁用", "disabled"),
-            ("待审核", "pending")
-        ]
-        
-        for text, value in statuses:
+        for text, value in _STATUS_CHOICES:
             rb = ttk.Radiobutton(status_frame, text=text, variable=self.status_var, value=value)
             rb.pack(anchor='w', pady=2)
     
     def _create_permissions_field(self, parent):
         """创建权限设置字段"""
         # 标签
-        label = ttk.Label(parent, text="权限设置", font=('Segoe UI', 10, 'bold'))
+        label = ttk.Label(parent, text="权限设置", style='Form.TLabel')
         label.pack(anchor='w', pady=(15, 5))
         
         # 权限列表
         permissions_frame = ttk.Frame(parent)
         permissions_frame.pack(fill='x', pady=(0, 5))
         
-        # 定义权限选项
-        permission_options = [
-            ("用户管理", "user_management"),
-            ("订单管理", "order_management"),
-            ("库存管理", "inventory_management"),
-            ("财务管理", "financial_management"),
-            ("报表查看", "report_view"),
-            ("系统设置", "system_settings"),
-            ("数据导入导出", "data_import_export"),
-            ("会员管理", "member_management")
-        ]
-        
         self.permission_vars = {}
-        for text, value in permission_options:
+        for text, value in _PERMISSION_OPTIONS:
             var = tk.BooleanVar()
             cb = ttk.Checkbutton(permissions_frame, text=text, variable=var)
             cb.pack(anchor='w', pady=2)
@@ -289,15 +406,19 @@ class UserFormDialog(BaseDialog):
         self.status_var.set(self.user.status)
         
         # 设置权限
+        perm_set = self.user.permissions_set
         for perm, var in self.permission_vars.items():
-            var.set(perm in self.user.permissions)
+            var.set(perm in perm_set)
     
     def confirm(self):
         """确认提交"""
         try:
+            # 一次性读取所有输入框的值
+            values = {name: entry.get().strip() for name, entry in self.entries.items()}
+            
             # 验证必填字段
-            username = self.entries['username'].get().strip()
-            email = self.entries['email'].get().strip()
+            username = values['username']
+            email = values['email']
             
             if not username:
                 messagebox.showerror("错误", "用户名不能为空")
@@ -311,15 +432,15 @@ class UserFormDialog(BaseDialog):
             data = {
                 'username': username,
                 'email': email,
-                'phone': self.entries['phone'].get().strip(),
-                'department': self.entries['department'].get().strip(),
+                'phone': values['phone'],
+                'department': values['department'],
                 'role': self.role_var.get(),
                 'status': self.status_var.get()
             }
             
             # 如果是新建用户，添加密码
             if not self.user:
-                password = self.entries['password'].get().strip()
+                password = values['password']
                 if not password:
                     messagebox.showerror("错误", "密码不能为空")
                     return
@@ -350,6 +471,8 @@ class PermissionManagementDialog(BaseDialog):
     
     def create_widget(self):
         """创建权限管理界面"""
+        _init_styles(self.root)
+        
         # 主容器
         main_frame = ttk.Frame(self.root, padding="20")
         main_frame.pack(fill='both', expand=True)
@@ -358,7 +481,7 @@ class PermissionManagementDialog(BaseDialog):
         user_info_label = ttk.Label(
             main_frame, 
             text=f"用户: {self.user.username} ({self.user.email})",
-            font=('Segoe UI', 12, 'bold')
+            style='FormSubtitle.TLabel'
         )
         user_info_label.pack(pady=(0, 20))
         
@@ -366,22 +489,20 @@ class PermissionManagementDialog(BaseDialog):
         tree_frame = ttk.Frame(main_frame)
         tree_frame.pack(fill='both', expand=True, pady=(0, 20))
         
-        self.permission_tree = ttk.Treeview(tree_frame, show='tree headings')
+        self.permission_tree = ttk.Treeview(
+            tree_frame, columns=("read", "write", "delete", "admin"), show='tree headings'
+        )
         scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.permission_tree.yview)
         self.permission_tree.configure(yscrollcommand=scrollbar.set)
         
         # 配置列
-        self.permission_tree.heading("#0", text="功能模块")
-        self.permission_tree.heading("read", text="查看")
-        self.permission_tree.heading("write", text="编辑")
-        self.permission_tree.heading("delete", text="删除")
-        self.permission_tree.heading("admin", text="管理")
-        
-        self.permission_tree.column("#0", width=200)
-        self.permission_tree.column("read", width=80)
-        self.permission_tree.column("write", width=80)
-        self.permission_tree.column("delete", width=80)
-        self.permission_tree.column("admin", width=80)
+        _setup_columns(self.permission_tree, (
+            ("#0", "功能模块", 200),
+            ("read", "查看", 80),
+            ("write", "编辑", 80),
+            ("delete", "删除", 80),
+            ("admin", "管理", 80)
+        ))
         
         # 权限数据
         self._create_permission_tree()
@@ -411,76 +532,39 @@ class PermissionManagementDialog(BaseDialog):
         info_label = ttk.Label(
             main_frame,
             text="提示：勾选相应权限，复选框表示拥有该权限",
-            font=('Segoe UI', 8)
+            style='FormHint.TLabel'
         )
         info_label.pack(anchor='w', pady=(10, 0))
     
     def _create_permission_tree(self):
         """创建权限树"""
-        # 权限数据
-        permissions_data = {
-            "用户管理": {
-                "view_users": {"read": True, "write": False, "delete": False, "admin": False},
-                "edit_users": {"read": True, "write": True, "delete": False, "admin": False},
-                "manage_users": {"read": True, "write": True, "delete": True, "admin": True}
-            },
-            "订单管理": {
-                "view_orders": {"read": True, "write": False, "delete": False, "admin": False},
-                "edit_orders": {"read": True, "write": True, "delete": False, "admin": False},
-                "manage_orders": {"read": True, "write": True, "delete": True, "admin": True}
-            },
-            "库存管理": {
-                "view_inventory": {"read": True, "write": False, "delete": False, "admin": False},
-                "edit_inventory": {"read": True, "write": True, "delete": False, "admin": False},
-                "manage_inventory": {"read": True, "write": True, "delete": True, "admin": True}
-            },
-            "财务管理": {
-                "view_finance": {"read": True, "write": False, "delete": False, "admin": False},
-                "edit_finance": {"read": True, "write": True, "delete": False, "admin": False},
-                "manage_finance": {"read": True, "write": True, "delete": True, "admin": True}
-            }
-        }
+        # 叶子节点 -> 权限标识（按插入顺序，确认时无需再查询节点文本）
+        self._leaf_perms = {}
+        user_perms = self.user.permissions_set
         
         # 创建树形结构
-        for module_name, module_permissions in permissions_data.items():
+        for module_name, module_permissions in _PERMISSIONS_DATA.items():
             # 插入模块
             module_id = self.permission_tree.insert("", "end", text=module_name, open=True)
             
-            # 插入权限项
+            # 插入权限项（用户已有的权限在插入时直接打上选中标签）
             for perm_name, perm_data in module_permissions.items():
                 item_id = self.permission_tree.insert(
                     module_id, "end", 
-                    text=perm_name.replace("_", " ").title(),
-                    values=(perm_data["read"], perm_data["write"], perm_data["delete"], perm_data["admin"])
+                    text=_PERM_DISPLAY[perm_name],
+                    values=(perm_data["read"], perm_data["write"], perm_data["delete"], perm_data["admin"]),
+                    tags=("selected",) if perm_name in user_perms else ()
                 )
-                
-                # 如果用户已有该权限，选中
-                if perm_name in self.user.permissions:
-                    # 这里应该根据实际的权限数据结构来设置
-                    # 简化处理
-                    self.permission_tree.item(item_id, tags=("selected",))
+                self._leaf_perms[item_id] = perm_name
         
         # 配置复选框样式
         self.permission_tree.tag_configure("selected", background="lightblue")
     
     def confirm(self):
         """确认权限设置"""
-        # 收集选中的权限
-        selected_permissions = []
-        
-        def collect_permissions(parent=""):
-            for item in self.permission_tree.get_children(parent):
-                item_text = self.permission_tree.item(item, "text")
-                if self.permission_tree.get_children(item):  # 有子项
-                    collect_permissions(item)
-                else:  # 叶子节点
-                    # 检查是否选中
-                    if item in self.permission_tree.selection():
-                        selected_permissions.append(item_text.lower().replace(" ", "_"))
-        
-        collect_permissions()
-        
-        self.result = selected_permissions
+        # 收集选中的权限（选中项只查询一次，按树中顺序遍历叶子节点）
+        selected = frozenset(self.permission_tree.selection())
+        self.result = [perm for item, perm in self._leaf_perms.items() if item in selected]
         self.root.destroy()
     
     def cancel(self):
@@ -492,9 +576,24 @@ class PermissionManagementDialog(BaseDialog):
 class ActivityLogDialog(BaseDialog):
     """活动日志对话框"""
     
+    # 每次插入表格的日志行数，滚动接近底部时再追加
+    LOG_PAGE_SIZE = 200
+    
     def __init__(self, parent: tk.Widget, user: User = None):
         self.user = user
         self.result = None
+        self._rows = []      # 全部日志行
+        self._shown = 0      # 已插入表格的行数
+        # 筛选结果缓存：(开始日期, 结束日期, 用户ID) -> 日志元组，重新加载日志时清空
+        self._filter_cache = {}
+        # 模拟日志数据
+        self._all_logs = (
+            ActivityLog(1, 1, "登录", "用户成功登录系统", "2025-11-08 10:30:15", "192.168.1.100"),
+            ActivityLog(2, 1, "修改资料", "更新了用户个人信息", "2025-11-08 09:15:20", "192.168.1.100"),
+            ActivityLog(3, 1, "订单操作", "创建了新的销售订单", "2025-11-07 16:45:30", "192.168.1.100"),
+            ActivityLog(4, 1, "权限变更", "用户权限被修改", "2025-11-07 14:20:10", "192.168.1.200"),
+            ActivityLog(5, 2, "登录", "用户成功登录系统", "2025-11-08 11:00:00", "192.168.1.101")
+        )
         super().__init__("活动日志" if not user else f"用户活动日志 - {user.username}", 
                         parent, width=800, height=600)
     
@@ -512,12 +611,12 @@ class ActivityLogDialog(BaseDialog):
         ttk.Label(filter_frame, text="开始日期:").pack(side='left', padx=(0, 5))
         self.start_date = ttk.Entry(filter_frame, width=12)
         self.start_date.pack(side='left', padx=(0, 10))
-        self.start_date.insert(0, (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d"))
+        self.start_date.insert(0, (date.today() - timedelta(days=30)).isoformat())
         
         ttk.Label(filter_frame, text="结束日期:").pack(side='left', padx=(0, 5))
         self.end_date = ttk.Entry(filter_frame, width=12)
         self.end_date.pack(side='left', padx=(0, 10))
-        self.end_date.insert(0, datetime.now().strftime("%Y-%m-%d"))
+        self.end_date.insert(0, date.today().isoformat())
         
         # 搜索按钮
         search_btn = ttk.Button(filter_frame, text="搜索", command=self.search_logs)
@@ -542,17 +641,19 @@ class ActivityLogDialog(BaseDialog):
         self.log_tree = ttk.Treeview(log_frame, columns=columns, show='headings', height=15)
         
         # 配置列
-        for col in columns:
-            self.log_tree.heading(col, text=col)
-            self.log_tree.column(col, width=150)
+        _setup_columns(self.log_tree, [(col, col, 150) for col in columns])
         
-        # 滚动条
-        log_scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_tree.yview)
-        self.log_tree.configure(yscrollcommand=log_scrollbar.set)
+        # 滚动条（视图变化时检查是否需要追加日志）
+        self.log_scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_tree.yview)
+        self.log_tree.configure(yscrollcommand=self._on_log_yscroll)
         
         # 布局
         self.log_tree.pack(side="left", fill='both', expand=True)
-        log_scrollbar.pack(side="right", fill='y')
+        self.log_scrollbar.pack(side="right", fill='y')
+        
+        # 加载更多按钮（全部显示后禁用）
+        self.load_more_btn = ttk.Button(main_frame, text="加载更多", command=self._show_more_logs)
+        self.load_more_btn.pack(pady=(10, 0))
         
         # 加载日志数据
         self.load_logs()
@@ -561,44 +662,72 @@ class ActivityLogDialog(BaseDialog):
         close_btn = ttk.Button(main_frame, text="关闭", command=self.close_dialog)
         close_btn.pack(pady=(15, 0))
     
-    def load_logs(self):
-        """加载日志数据"""
-        # 清空现有数据
-        for item in self.log_tree.get_children():
-            self.log_tree.delete(item)
-        
-        # 模拟日志数据
-        logs_data = [
-            ActivityLog(1, 1, "登录", "用户成功登录系统", "2025-11-08 10:30:15", "192.168.1.100"),
-            ActivityLog(2, 1, "修改资料", "更新了用户个人信息", "2025-11-08 09:15:20", "192.168.1.100"),
-            ActivityLog(3, 1, "订单操作", "创建了新的销售订单", "2025-11-07 16:45:30", "192.168.1.100"),
-            ActivityLog(4, 1, "权限变更", "用户权限被修改", "2025-11-07 14:20:10", "192.168.1.200"),
-            ActivityLog(5, 2, "登录", "用户成功登录系统", "2025-11-08 11:00:00", "192.168.1.101")
-        ]
-        
-        # 如果指定了用户，过滤日志
+    def load_logs(self, start_date: str = "", end_date: str = ""):
+        """加载日志数据（可按日期范围筛选）"""
+        # 清空现有数据（一次调用删除全部行）
+        children = self.log_tree.get_children()
+        if children:
+            self.log_tree.delete(*children)
+        
+        # 按日期和用户筛选日志
+        user_id = self.user.user_id if self.user else None
+        key = (start_date, end_date, user_id)
+        logs_data = self._filter_cache.get(key)
+        if logs_data is None:
+            logs_data = _filter_logs(self._all_logs, start_date, end_date, user_id)
+            self._filter_cache[key] = logs_data
+        
+        # 先生成全部行，再批量插入
         if self.user:
-            logs_data = [log for log in logs_data if log.user_id == self.user.user_id]
-        
-        # 插入日志数据
-        for log in logs_data:
-            username = f"用户{log.user_id}" if not self.user else self.user.username
-            self.log_tree.insert('', 'end', values=(
-                log.timestamp, username, log.action, log.details, log.ip_address
-            ))
+            username = self.user.username
+            rows = [
+                (log.timestamp, username, log.action, log.details, log.ip_address)
+                for log in logs_data
+            ]
+        else:
+            rows = [
+                (log.timestamp, f"用户{log.user_id}", log.action, log.details, log.ip_address)
+                for log in logs_data
+            ]
+        
+        # 只插入第一页，其余在滚动到底部时追加
+        self._rows = rows
+        self._shown = 0
+        self._show_more_logs()
+    
+    def _show_more_logs(self):
+        """追加下一页日志到表格"""
+        start = self._shown
+        end = min(start + self.LOG_PAGE_SIZE, len(self._rows))
+        insert = self.log_tree.insert
+        for values in self._rows[start:end]:
+            insert('', 'end', values=values)
+        self._shown = end
+        self.load_more_btn.configure(state='normal' if end < len(self._rows) else 'disabled')
+    
+    def _on_log_yscroll(self, first, last):
+        """表格视图变化：更新滚动条，接近底部时追加日志"""
+        self.log_scrollbar.set(first, last)
+        if float(last) > 0.9 and self._shown < len(self._rows):
+            self._show_more_logs()
     
     def search_logs(self):
         """搜索日志"""
-        start_date = self.start_date.get()
-        end_date = self.end_date.get()
+        # 日期只解析一次并规范化，筛选时与时间戳前缀直接按字符串比较
+        try:
+            start_date = _parse_date(self.start_date.get().strip())
+            end_date = _parse_date(self.end_date.get().strip())
+        except ValueError:
+            messagebox.showerror("错误", "日期格式应为 YYYY-MM-DD")
+            return
         
-        # 这里应该实现实际的搜索逻辑
-        # 简化处理，只是重新加载
-        self.load_logs()
+        self.load_logs(start_date, end_date)
         messagebox.showinfo("提示", f"已搜索 {start_date} 到 {end_date} 的日志")
     
     def refresh_logs(self):
         """刷新日志"""
+        # 日志重新加载后旧的筛选结果失效
+        self._filter_cache.clear()
         self.load_logs()
         messagebox.showinfo("提示", "日志已刷新")
     
@@ -614,12 +743,45 @@ class ActivityLogDialog(BaseDialog):
 class SecuritySettingsDialog(BaseDialog):
     """安全设置对话框"""
     
+    # 复选框规格：(显示文本, 变量属性名, 默认值)，按分组顺序排列
+    _PW_CHECKS = (
+        ("必须包含大写字母", "require_upper_var", True),
+        ("必须包含小写字母", "require_lower_var", True),
+        ("必须包含数字", "require_number_var", True),
+        ("必须包含特殊字符", "require_special_var", False),
+    )
+    _SESSION_CHECKS = (
+        ("会话超时后强制登出", "force_logout_var", True),
+    )
+    _2FA_CHECKS = (
+        ("启用双因素认证", "enable_2fa_var", False),
+        ("强制所有用户使用双因素认证", "enforce_2fa_var", False),
+    )
+    _ENCRYPT_CHECKS = (
+        ("加密敏感数据", "encrypt_sensitive_var", True),
+        ("加密用户密码", "encrypt_passwords_var", True),
+    )
+    _BACKUP_CHECKS = (
+        ("自动备份用户数据", "auto_backup_var", True),
+    )
+    _ACCESS_LOG_CHECKS = (
+        ("记录所有用户访问", "log_access_var", True),
+        ("记录数据变更", "log_data_changes_var", True),
+    )
+    _ALL_CHECKS = (_PW_CHECKS + _SESSION_CHECKS + _2FA_CHECKS
+                   + _ENCRYPT_CHECKS + _BACKUP_CHECKS + _ACCESS_LOG_CHECKS)
+    
     def __init__(self, parent: tk.Widget):
         self.result = None
         super().__init__("安全设置", parent, width=600, height=500)
     
     def create_widget(self):
         """创建安全设置界面"""
+        _init_styles(self.root)
+        
+        # 设置变量先行创建，未打开的选项卡也能保存
+        self._create_setting_vars()
+        
         # 主容器
         main_frame = ttk.Frame(self.root, padding="20")
         main_frame.pack(fill='both', expand=True)
@@ -628,22 +790,26 @@ class SecuritySettingsDialog(BaseDialog):
         title_label = ttk.Label(
             main_frame, 
             text="系统安全设置",
-            font=('Segoe UI', 16, 'bold')
+            style='FormTitle.TLabel'
         )
         title_label.pack(pady=(0, 20))
         
-        # 创建选项卡
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(fill='both', expand=True)
-        
-        # 密码策略选项卡
-        self._create_password_policy_tab(notebook)
+        # 创建选项卡（仅创建空白页，内容在首次切换到该页时构建）
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill='both', expand=True)
         
-        # 登录安全选项卡
-        self._create_login_security_tab(notebook)
+        self._tab_builders = {}
+        for text, builder in (
+            ("密码策略", self._create_password_policy_tab),
+            ("登录安全", self._create_login_security_tab),
+            ("数据保护", self._create_data_protection_tab)
+        ):
+            tab = ttk.Frame(self.notebook)
+            self.notebook.add(tab, text=text)
+            self._tab_builders[str(tab)] = (tab, builder)
         
-        # 数据保护选项卡
-        self._create_data_protection_tab(notebook)
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._on_tab_changed()
         
         # 按钮框架
         button_frame = ttk.Frame(main_frame)
@@ -666,43 +832,59 @@ class SecuritySettingsDialog(BaseDialog):
         reset_btn = ttk.Button(button_frame, text="重置为默认", command=self.reset_to_default)
         reset_btn.pack(side='right', padx=(0, 10))
     
-    def _create_password_policy_tab(self, notebook):
-        """创建密码策略选项卡"""
-        tab = ttk.Frame(notebook)
-        notebook.add(tab, text="密码策略")
+    def _create_setting_vars(self):
+        """创建所有设置项变量（默认值）"""
+        # 复选框变量由规格表生成
+        for _, attr, default in self._ALL_CHECKS:
+            setattr(self, attr, tk.BooleanVar(value=default))
+        
+        # 密码策略
+        self.min_length_var = tk.IntVar(value=8)
+        self.password_expiry_var = tk.IntVar(value=90)
+        self.password_history_var = tk.IntVar(value=5)
         
+        # 登录安全
+        self.max_attempts_var = tk.IntVar(value=5)
+        self.lockout_duration_var = tk.IntVar(value=15)
+        self.session_timeout_var = tk.IntVar(value=30)
+        
+        # 数据保护
+        self.backup_frequency_var = tk.StringVar(value="daily")
+        self.log_retention_var = tk.IntVar(value=90)
+    
+    def _pack_checks(self, tab, specs):
+        """按规格表依次创建复选框"""
+        for text, attr, _ in specs:
+            ttk.Checkbutton(tab, text=text, variable=getattr(self, attr)).pack(anchor='w', pady=2)
+    
+    def _on_tab_changed(self, event=None):
+        """切换选项卡时按需构建其内容（每页只构建一次）"""
+        entry = self._tab_builders.pop(self.notebook.select(), None)
+        if entry:
+            tab, builder = entry
+            builder(tab)
+    
+    def _create_password_policy_tab(self, tab):
+        """创建密码策略选项卡"""
         # 密码长度
-        ttk.Label(tab, text="最小密码长度:", font=('Segoe UI', 10, 'bold')).pack(anchor='w', pady=(20, 5))
+        ttk.Label(tab, text="最小密码长度:", style='Form.TLabel').pack(anchor='w', pady=(20, 5))
         length_frame = ttk.Frame(tab)
         length_frame.pack(fill='x', pady=(0, 15))
         
-        self.min_length_var = tk.IntVar(value=8)
         length_spinbox = ttk.Spinbox(length_frame, from_=6, to=20, textvariable=self.min_length_var, width=10)
         length_spinbox.pack(side='left')
         ttk.Label(length_frame, text="字符").pack(side='left', padx=(10, 0))
         
         # 密码复杂度
-        ttk.Label(tab, text="密码复杂度要求:", font=('Segoe UI', 10, 'bold')).pack(anchor='w', pady=(15, 5))
-        
-        self.require_upper_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(tab, text="必须包含大写字母", variable=self.require_upper_var).pack(anchor='w', pady=2)
-        
-        self.require_lower_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(tab, text="必须包含小写字母", variable=self.require_lower_var).pack(anchor='w', pady=2)
-        
-        self.require_number_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(tab, text="必须包含数字", variable=self.require_number_var).pack(anchor='w', pady=2)
-        
-        self.require_special_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(tab, text="必须包含特殊字符", variable=self.require_special_var).pack(anchor='w', pady=2)
+        ttk.Label(tab, text="密码复杂度要求:", style='Form.TLabel').pack(anchor='w', pady=(15, 5))
+        self._pack_checks(tab, self._PW_CHECKS)
         
         # 密码过期
-        ttk.Label(tab, text="密码过期设置:", font=('Segoe UI', 10, 'bold')).pack(anchor='w', pady=(20, 5))
+        ttk.Label(tab, text="密码过期设置:", style='Form.TLabel').pack(anchor='w', pady=(20, 5))
         
         password_expiry_frame = ttk.Frame(tab)
         password_expiry_frame.pack(fill='x', pady=(0, 15))
         
-        self.password_expiry_var = tk.IntVar(value=90)
         expiry_spinbox = ttk.Spinbox(
             password_expiry_frame, from_=0, to=365, 
             textvariable=self.password_expiry_var, width=10
@@ -715,7 +897,6 @@ class SecuritySettingsDialog(BaseDialog):
         history_frame.pack(fill='x', pady=(0, 15))
         
         ttk.Label(history_frame, text="密码历史记录:").pack(side='left')
-        self.password_history_var = tk.IntVar(value=5)
         history_spinbox = ttk.Spinbox(
             history_frame, from_=0, to=20, 
             textvariable=self.password_history_var, width=10
@@ -723,19 +904,15 @@ class SecuritySettingsDialog(BaseDialog):
         history_spinbox.pack(side='left', padx=(10, 0))
         ttk.Label(history_frame, text="次 (防止重复使用)").pack(side='left', padx=(10, 0))
     
-    def _create_login_security_tab(self, notebook):
+    def _create_login_security_tab(self, tab):
         """创建登录安全选项卡"""
-        tab = ttk.Frame(notebook)
-        notebook.add(tab, text="登录安全")
-        
         # 登录尝试限制
-        ttk.Label(tab, text="登录尝试限制:", font=('Segoe UI', 10, 'bold')).pack(anchor='w', pady=(20, 5))
+        ttk.Label(tab, text="登录尝试限制:", style='Form.TLabel').pack(anchor='w', pady=(20, 5))
         
         attempt_frame = ttk.Frame(tab)
         attempt_frame.pack(fill='x', pady=(0, 15))
         
         ttk.Label(attempt_frame, text="最大失败次数:").pack(side='left')
-        self.max_attempts_var = tk.IntVar(value=5)
         attempt_spinbox = ttk.Spinbox(
             attempt_frame, from_=3, to=10, 
             textvariable=self.max_attempts_var, width=10
@@ -746,7 +923,6 @@ class SecuritySettingsDialog(BaseDialog):
         lockout_frame.pack(fill='x', pady=(0, 15))
         
         ttk.Label(lockout_frame, text="锁定时间:").pack(side='left')
-        self.lockout_duration_var = tk.IntVar(value=15)
         lockout_spinbox = ttk.Spinbox(
             lockout_frame, from_=5, to=60, 
             textvariable=self.lockout_duration_var, width=10
@@ -755,9 +931,8 @@ class SecuritySettingsDialog(BaseDialog):
         ttk.Label(lockout_frame, text="分钟").pack(side='left', padx=(10, 0))
         
         # 会话管理
-        ttk.Label(tab, text="会话管理:", font=('Segoe UI', 10, 'bold')).pack(anchor='w', pady=(20, 5))
+        ttk.Label(tab, text="会话管理:", style='Form.TLabel').pack(anchor='w', pady=(20, 5))
         
-        self.session_timeout_var = tk.IntVar(value=30)
         timeout_frame = ttk.Frame(tab)
         timeout_frame.pack(fill='x', pady=(0, 15))
         
@@ -769,67 +944,29 @@ class SecuritySettingsDialog(BaseDialog):
         timeout_spinbox.pack(side='left', padx=(10, 0))
         ttk.Label(timeout_frame, text="分钟").pack(side='left', padx=(10, 0))
         
-        self.force_logout_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(
-            tab, 
-            text="会话超时后强制登出", 
-            variable=self.force_logout_var
-        ).pack(anchor='w', pady=2)
+        self._pack_checks(tab, self._SESSION_CHECKS)
         
         # 双因素认证
-        ttk.Label(tab, text="双因素认证:", font=('Segoe UI', 10, 'bold')).pack(anchor='w', pady=(20, 5))
-        
-        self.enable_2fa_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(
-            tab, 
-            text="启用双因素认证", 
-            variable=self.enable_2fa_var
-        ).pack(anchor='w', pady=2)
-        
-        self.enforce_2fa_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(
-            tab, 
-            text="强制所有用户使用双因素认证", 
-            variable=self.enforce_2fa_var
-        ).pack(anchor='w', pady=2)
-    
-    def _create_data_protection_tab(self, notebook):
-        """创建数据保护选项卡"""
-        tab = ttk.Frame(notebook)
-        notebook.add(tab, text="数据保护")
+        ttk.Label(tab, text="双因素认证:", style='Form.TLabel').pack(anchor='w', pady=(20, 5))
         
+        self._pack_checks(tab, self._2FA_CHECKS)
+    
+    def _create_data_protection_tab(self, tab):
+        """创建数据保护选项卡"""
         # 数据加密
-        ttk.Label(tab, text="数据加密:", font=('Segoe UI', 10, 'bold')).pack(anchor='w', pady=(20, 5))
-        
-        self.encrypt_sensitive_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(
-            tab, 
-            text="加密敏感数据", 
-            variable=self.encrypt_sensitive_var
-        ).pack(anchor='w', pady=2)
-        
-        self.encrypt_passwords_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(
-            tab, 
-            text="加密用户密码", 
-            variable=self.encrypt_passwords_var
-        ).pack(anchor='w', pady=2)
+        ttk.Label(tab, text="数据加密:", style='Form.TLabel').pack(anchor='w', pady=(20, 5))
+        
+        self._pack_checks(tab, self._ENCRYPT_CHECKS)
         
         # 数据备份
-        ttk.Label(tab, text="数据备份:", font=('Segoe UI', 10, 'bold')).pack(anchor='w', pady=(20, 5))
+        ttk.Label(tab, text="数据备份:", style='Form.TLabel').pack(anchor='w', pady=(20, 5))
         
-        self.auto_backup_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(
-            tab, 
-            text="自动备份用户数据", 
-            variable=self.auto_backup_var
-        ).pack(anchor='w', pady=2)
+        self._pack_checks(tab, self._BACKUP_CHECKS)
         
         backup_freq_frame = ttk.Frame(tab)
         backup_freq_frame.pack(fill='x', pady=(5, 15))
         
         ttk.Label(backup_freq_frame, text="备份频率:").pack(side='left')
-        self.backup_frequency_var = tk.StringVar(value="daily")
         backup_combo = ttk.Combobox(
             backup_freq_frame, 
             textvariable=self.backup_frequency_var,
@@ -840,27 +977,14 @@ class SecuritySettingsDialog(BaseDialog):
         backup_combo.pack(side='left', padx=(10, 0))
         
         # 访问日志
-        ttk.Label(tab, text="访问日志:", font=('Segoe UI', 10, 'bold')).pack(anchor='w', pady=(20, 5))
-        
-        self.log_access_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(
-            tab, 
-            text="记录所有用户访问", 
-            variable=self.log_access_var
-        ).pack(anchor='w', pady=2)
-        
-        self.log_data_changes_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(
-            tab, 
-            text="记录数据变更", 
-            variable=self.log_data_changes_var
-        ).pack(anchor='w', pady=2)
+        ttk.Label(tab, text="访问日志:", style='Form.TLabel').pack(anchor='w', pady=(20, 5))
+        
+        self._pack_checks(tab, self._ACCESS_LOG_CHECKS)
         
         retention_frame = ttk.Frame(tab)
         retention_frame.pack(fill='x', pady=(5, 15))
         
         ttk.Label(retention_frame, text="日志保留时间:").pack(side='left')
-        self.log_retention_var = tk.IntVar(value=90)
         retention_spinbox = ttk.Spinbox(
             retention_frame, from_=30, to=365, 
             textvariable=self.log_retention_var, width=10
@@ -923,34 +1047,58 @@ class SecuritySettingsDialog(BaseDialog):
             messagebox.showinfo("提示", "已重置为默认设置")
 
 
+# 模拟用户数据（User 构造参数）
+_DEMO_USERS = (
+    (1, "admin", "admin@flowershop.com", "admin", "active",
+     "2025-01-01 08:00:00", "2025-11-08 11:00:00",
+     ("user_management", "system_settings"), "13800138000", "信息技术部"),
+    (2, "manager", "manager@flowershop.com", "manager", "active",
+     "2025-01-15 09:00:00", "2025-11-08 10:30:00",
+     ("order_management", "report_view"), "13800138001", "销售部"),
+    (3, "accountant", "accountant@flowershop.com", "accountant", "active",
+     "2025-02-01 10:00:00", "2025-11-07 16:45:00",
+     ("financial_management", "report_view"), "13800138002", "财务部"),
+    (4, "sales001", "sales001@flowershop.com", "sales", "active",
+     "2025-03-01 11:00:00", "2025-11-08 09:15:00",
+     ("order_management", "member_management"), "13800138003", "销售部"),
+    (5, "disabled_user", "disabled@flowershop.com", "user", "disabled",
+     "2025-04-01 12:00:00", "2025-10-15 14:20:00",
+     ("order_management",), "13800138004", "客服部")
+)
+
+
 class UserManagementGUI(BaseFrame):
     """用户管理主界面"""
     
-    def __init__(self, parent: tk.Widget):
+    # 搜索框输入防抖间隔（毫秒），连续输入时只在停顿后执行一次搜索
+    SEARCH_DEBOUNCE_MS = 150
+    
+    def __init__(self, parent: tk.Widget, *, users: List[User] = None):
         super().__init__(parent)
         
-        # 模拟用户数据
-        self.users = [
-            User(1, "admin", "admin@flowershop.com", "admin", "active", 
-                 "2025-01-01 08:00:00", "2025-11-08 11:00:00",
-                 ["user_management", "system_settings"], "13800138000", "信息技术部"),
-            User(2, "manager", "manager@flowershop.com", "manager", "active",
-                 "2025-01-15 09:00:00", "2025-11-08 10:30:00",
-                 ["order_management", "report_view"], "13800138001", "销售部"),
-            User(3, "accountant", "accountant@flowershop.com", "accountant", "active",
-                 "2025-02-01 10:00:00", "2025-11-07 16:45:00",
-                 ["financial_management", "report_view"], "13800138002", "财务部"),
-            User(4, "sales001", "sales001@flowershop.com", "sales", "active",
-                 "2025-03-01 11:00:00", "2025-11-08 09:15:00",
-                 ["order_management", "member_management"], "13800138003", "销售部"),
-            User(5, "disabled_user", "disabled@flowershop.com", "user", "disabled",
-                 "2025-04-01 12:00:00", "2025-10-15 14:20:00",
-                 ["order_management"], "13800138004", "客服部")
-        ]
+        # 未提供用户数据时使用模拟数据（每个界面各自一份，编辑不会互相影响）
+        if users is None:
+            # 权限在模拟数据中为元组，转为列表以便编辑
+            users = [User(*args[:7], list(args[7]), *args[8:]) for args in _DEMO_USERS]
+        self.users = users
         
         self.current_user = None
         self.search_var = tk.StringVar()
         self.filter_var = tk.StringVar()
+        
+        # 表格行标识（按用户顺序）、当前显示的行及上次搜索文本
+        self._user_iids = []
+        # 搜索索引：与 _user_iids 对齐的小写 "用户名\0邮箱\0手机号"
+        self._search_index = []
+        self._visible_iids = set()
+        self._last_search = None
+        self._search_after_id = None
+        # 用户ID -> 用户（随 load_users 重建）
+        self._users_by_id = {}
+        # 用户ID -> 表格行值，用户信息变更时丢弃对应条目
+        self._row_cache = {}
+        # 状态管理对话框（首次使用时创建）
+        self._status_window = None
     
     def create_widget(self):
         """创建用户管理界面"""
@@ -961,21 +1109,31 @@ class UserManagementGUI(BaseFrame):
         # 顶部工具栏
         self._create_toolbar(main_frame)
         
-        # 创建选项卡
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(fill='both', expand=True, pady=(10, 0))
-        
-        # 用户管理选项卡
-        self._create_user_management_tab(notebook)
-        
-        # 权限管理选项卡
-        self._create_permission_management_tab(notebook)
-        
-        # 活动日志选项卡
-        self._create_activity_log_tab(notebook)
-        
-        # 安全设置选项卡
-        self._create_security_settings_tab(notebook)
+        # 创建选项卡（仅创建空白页，内容在首次切换到该页时构建）
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill='both', expand=True, pady=(10, 0))
+        
+        self.log_tree = None
+        self._tab_builders = {}
+        for text, builder in (
+            ("用户管理", self._create_user_management_tab),
+            ("权限管理", self._create_permission_management_tab),
+            ("活动日志", self._create_activity_log_tab),
+            ("安全设置", self._create_security_settings_tab)
+        ):
+            tab = ttk.Frame(self.notebook)
+            self.notebook.add(tab, text=text)
+            self._tab_builders[str(tab)] = (tab, builder)
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._on_tab_changed()
+    
+    def _on_tab_changed(self, event=None):
+        """切换选项卡时按需构建其内容（每页只构建一次）"""
+        entry = self._tab_builders.pop(self.notebook.select(), None)
+        if entry:
+            tab, builder = entry
+            builder(tab)
     
     def _create_toolbar(self, parent):
         """创建工具栏"""
@@ -1020,11 +1178,8 @@ class UserManagementGUI(BaseFrame):
         )
         refresh_btn.pack(side='left')
     
-    def _create_user_management_tab(self, notebook):
+    def _create_user_management_tab(self, tab):
         """创建用户管理选项卡"""
-        tab = ttk.Frame(notebook)
-        notebook.add(tab, text="用户管理")
-        
         # 操作按钮组
         button_frame = ttk.Frame(tab)
         button_frame.pack(fill='x', pady=(0, 10))
@@ -1080,10 +1235,8 @@ class UserManagementGUI(BaseFrame):
         self.user_tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
         
         # 配置列
-        column_widths = [50, 120, 180, 80, 80, 100, 120, 120, 120, 80]
-        for i, col in enumerate(columns):
-            self.user_tree.heading(col, text=col)
-            self.user_tree.column(col, width=column_widths[i])
+        column_widths = (50, 120, 180, 80, 80, 100, 120, 120, 120, 80)
+        _setup_columns(self.user_tree, zip(columns, columns, column_widths))
         
         # 滚动条
         user_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.user_tree.yview)
@@ -1107,11 +1260,8 @@ class UserManagementGUI(BaseFrame):
         # 加载用户数据
         self.load_users()
     
-    def _create_permission_management_tab(self, notebook):
+    def _create_permission_management_tab(self, tab):
         """创建权限管理选项卡"""
-        tab = ttk.Frame(notebook)
-        notebook.add(tab, text="权限管理")
-        
         # 权限概览
         overview_frame = ttk.LabelFrame(tab, text="权限概览", padding="10")
         overview_frame.pack(fill='x', pady=(0, 10))
@@ -1120,13 +1270,17 @@ class UserManagementGUI(BaseFrame):
         stats_frame = ttk.Frame(overview_frame)
         stats_frame.pack(fill='x')
         
+        # 一次遍历统计角色和状态
+        role_counts = Counter()
+        status_counts = Counter()
+        for user in self.users:
+            role_counts[user.role] += 1
+            status_counts[user.status] += 1
+        
         self._create_stat_card(stats_frame, "总用户数", len(self.users), 0)
-        self._create_stat_card(stats_frame, "管理员", 
-                              len([u for u in self.users if u.role == "admin"]), 1)
-        self._create_stat_card(stats_frame, "活跃用户", 
-                              len([u for u in self.users if u.status == "active"]), 2)
-        self._create_stat_card(stats_frame, "待审核", 
-                              len([u for u in self.users if u.status == "pending"]), 3)
+        self._create_stat_card(stats_frame, "管理员", role_counts["admin"], 1)
+        self._create_stat_card(stats_frame, "活跃用户", status_counts["active"], 2)
+        self._create_stat_card(stats_frame, "待审核", status_counts["pending"], 3)
         
         # 权限分配图表区域
         chart_frame = ttk.LabelFrame(tab, text="权限分配统计", padding="10")
@@ -1141,9 +1295,8 @@ class UserManagementGUI(BaseFrame):
         perm_columns = ('权限名称', '拥有用户数', '描述')
         self.perm_tree = ttk.Treeview(permission_list_frame, columns=perm_columns, show='headings', height=10)
         
-        for col in perm_columns:
-            self.perm_tree.heading(col, text=col)
-            self.perm_tree.column(col, width=200)
+        # 列宽 200 即 Tk 默认宽度
+        _setup_columns(self.perm_tree, [(col, col, None) for col in perm_columns])
         
         # 权限统计数据
         permission_stats = [
@@ -1156,8 +1309,9 @@ class UserManagementGUI(BaseFrame):
             ("会员管理", 2, "客户会员管理")
         ]
         
+        insert = self.perm_tree.insert
         for stat in permission_stats:
-            self.perm_tree.insert('', 'end', values=stat)
+            insert('', 'end', values=stat)
         
         # 权限详情按钮
         detail_btn = ttk.Button(
@@ -1175,11 +1329,8 @@ class UserManagementGUI(BaseFrame):
         self.perm_tree.pack(side="left", fill='both', expand=True)
         perm_scrollbar.pack(side="right", fill='y')
     
-    def _create_activity_log_tab(self, notebook):
+    def _create_activity_log_tab(self, tab):
         """创建活动日志选项卡"""
-        tab = ttk.Frame(notebook)
-        notebook.add(tab, text="活动日志")
-        
         # 日志控制面板
         control_frame = ttk.Frame(tab)
         control_frame.pack(fill='x', pady=(0, 10))
@@ -1222,7 +1373,7 @@ class UserManagementGUI(BaseFrame):
             text="导出日志", 
             command=self.export_logs
         )
-        view_all_btn.pack(side='right', padx=(5, 0))
+        export_btn.pack(side='right', padx=(5, 0))
         
         # 日志表格
         log_frame = ttk.Frame(tab)
@@ -1232,9 +1383,7 @@ class UserManagementGUI(BaseFrame):
         log_columns = ('时间', '用户', '操作', '详情', 'IP地址', '状态')
         self.log_tree = ttk.Treeview(log_frame, columns=log_columns, show='headings', height=15)
         
-        for col in log_columns:
-            self.log_tree.heading(col, text=col)
-            self.log_tree.column(col, width=150)
+        _setup_columns(self.log_tree, [(col, col, 150) for col in log_columns])
         
         # 滚动条
         log_scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_tree.yview)
@@ -1247,11 +1396,8 @@ class UserManagementGUI(BaseFrame):
         # 加载日志数据
         self.load_activity_logs()
     
-    def _create_security_settings_tab(self, notebook):
+    def _create_security_settings_tab(self, tab):
         """创建安全设置选项卡"""
-        tab = ttk.Frame(notebook)
-        notebook.add(tab, text="安全设置")
-        
         # 安全概览
         overview_frame = ttk.LabelFrame(tab, text="安全状态概览", padding="10")
         overview_frame.pack(fill='x', pady=(0, 10))
@@ -1312,9 +1458,7 @@ class UserManagementGUI(BaseFrame):
         security_columns = ('时间', '事件类型', '用户', 'IP地址', '状态', '描述')
         self.security_tree = ttk.Treeview(log_frame, columns=security_columns, show='headings', height=10)
         
-        for col in security_columns:
-            self.security_tree.heading(col, text=col)
-            self.security_tree.column(col, width=150)
+        _setup_columns(self.security_tree, [(col, col, 150) for col in security_columns])
         
         # 安全事件数据
         security_events = [
@@ -1324,8 +1468,9 @@ class UserManagementGUI(BaseFrame):
             ("2025-11-07 16:20:45", "异常登录", "manager", "192.168.1.150", "警告", "异地登录检测")
         ]
         
+        insert = self.security_tree.insert
         for event in security_events:
-            self.security_tree.insert('', 'end', values=event)
+            insert('', 'end', values=event)
         
         # 滚动条
         security_scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.security_tree.yview)
@@ -1376,38 +1521,59 @@ class UserManagementGUI(BaseFrame):
     
     def load_users(self):
         """加载用户数据"""
-        # 清空现有数据
-        for item in self.user_tree.get_children():
-            self.user_tree.delete(item)
-        
-        # 插入用户数据
+        # 清空现有数据（包括被搜索/筛选隐藏的行）
+        self.user_tree.delete(*self._user_iids)
+        
+        # 插入用户数据，以用户ID作为行标识，搜索和筛选时只隐藏/恢复行
+        insert = self.user_tree.insert
+        old_rows = self._row_cache
+        row_cache = self._row_cache = {}  # 只保留仍存在的用户
+        self._user_iids = []
         for user in self.users:
-            self.user_tree.insert('', 'end', values=(
-                user.user_id, user.username, user.email, user.role,
-                self._get_status_text(user.status), user.department,
-                user.phone, user.created_at, user.last_login or "从未登录",
-                len(user.permissions)
-            ))
+            user_id = user.user_id
+            row = old_rows.get(user_id)
+            if row is None:
+                row = self._user_row(user)
+            row_cache[user_id] = row
+            self._user_iids.append(insert('', 'end', iid=str(user_id), values=row))
+        self._visible_iids = set(self._user_iids)
+        self._users_by_id = {user.user_id: user for user in self.users}
+        # 用户数据只在增删改后重新加载，此时一并重建搜索索引
+        self._search_index = [
+            f"{user.username}\x00{user.email}\x00{user.phone}".lower()
+            for user in self.users
+        ]
+        self._last_search = None
         
         # 更新状态信息
         total_users = len(self.users)
-        active_users = len([u for u in self.users if u.status == "active"])
+        active_users = sum(user.status == "active" for user in self.users)
         self.info_label.config(text=f"共 {total_users} 个用户，{active_users} 个活跃用户")
     
+    def _user_row(self, user: User) -> tuple:
+        """生成用户在表格中的行值"""
+        return (
+            user.user_id, user.username, user.email, user.role,
+            self._get_status_text(user.status), user.department,
+            user.phone, user.created_at, user.last_login or "从未登录",
+            len(user.permissions)
+        )
+    
+    def _invalidate_row(self, user: User):
+        """用户信息变更后丢弃其缓存的行值"""
+        self._row_cache.pop(user.user_id, None)
+    
     def _get_status_text(self, status: str) -> str:
         """获取状态显示文本"""
-        status_map = {
-            "active": "活跃",
-            "disabled": "禁用",
-            "pending": "待审核"
-        }
-        return status_map.get(status, status)
+        return _STATUS_TEXT.get(status, status)
     
     def load_activity_logs(self):
         """加载活动日志数据"""
-        # 清空现有数据
-        for item in self.log_tree.get_children():
-            self.log_tree.delete(item)
+        # 清空现有数据（一次调用删除全部行）
+        log_tree = self.log_tree
+        children = log_tree.get_children()
+        if children:
+            log_tree.delete(*children)
         
         # 模拟日志数据
         logs_data = [
@@ -1419,17 +1585,16 @@ class UserManagementGUI(BaseFrame):
             ("2025-11-07 14:20:05", "unknown", "登录", "密码错误登录尝试", "192.168.1.200", "失败")
         ]
         
+        insert = log_tree.insert
         for log in logs_data:
-            self.log_tree.insert('', 'end', values=log)
+            insert('', 'end', values=log)
     
     def on_user_select(self, event):
         """用户选择事件"""
         selection = self.user_tree.selection()
         if selection:
-            item = selection[0]
-            user_id = self.user_tree.item(item, 'values')[0]
-            # 查找用户
-            self.current_user = next((u for u in self.users if u.user_id == int(user_id)), None)
+            # 行标识即用户ID，直接查表
+            self.current_user = self._users_by_id.get(int(selection[0]))
             self.info_label.config(text=f"已选择用户: {self.current_user.username}")
         else:
             self.current_user = None
@@ -1440,65 +1605,73 @@ class UserManagementGUI(BaseFrame):
         if self.current_user:
             self.edit_user()
     
+    def _show_user_rows(self, matches):
+        """只显示匹配的行：隐藏不再匹配的行，按原顺序恢复新匹配的行"""
+        tree = self.user_tree
+        hidden = self._visible_iids - matches
+        if hidden:
+            tree.detach(*hidden)
+        
+        visible = self._visible_iids - hidden
+        index = 0
+        for iid in self._user_iids:
+            if iid in matches:
+                if iid not in visible:
+                    tree.reattach(iid, '', index)
+                index += 1
+        self._visible_iids = set(matches)
+    
     def on_search(self, event):
-        """搜索事件"""
+        """搜索事件（防抖，连续输入只在最后一次按键后搜索）"""
+        if self._search_after_id:
+            self.user_tree.after_cancel(self._search_after_id)
+        self._search_after_id = self.user_tree.after(self.SEARCH_DEBOUNCE_MS, self._do_search)
+    
+    def _do_search(self):
+        """按搜索框内容筛选用户"""
+        self._search_after_id = None
         search_text = self.search_var.get().lower()
+        if search_text == self._last_search:
+            return
+        self._last_search = search_text
+        
         if not search_text:
-            self.load_users()
+            self._show_user_rows(set(self._user_iids))
             return
         
         # 筛选用户
-        filtered_users = []
-        for user in self.users:
-            if (search_text in user.username.lower() or 
-                search_text in user.email.lower() or
-                search_text in user.phone.lower()):
-                filtered_users.append(user)
-        
-        # 清空并重新加载
-        for item in self.user_tree.get_children():
-            self.user_tree.delete(item)
-        
-        for user in filtered_users:
-            self.user_tree.insert('', 'end', values=(
-                user.user_id, user.username, user.email, user.role,
-                self._get_status_text(user.status), user.department,
-                user.phone, user.created_at, user.last_login or "从未登录",
-                len(user.permissions)
-            ))
+        matches = {
+            iid for iid, text in zip(self._user_iids, self._search_index)
+            if search_text in text
+        }
+        self._show_user_rows(matches)
     
     def on_filter_change(self, event):
         """筛选变更事件"""
         filter_text = self.filter_var.get()
         if filter_text == "全部":
-            self.load_users()
+            self._show_user_rows(set(self._user_iids))
             return
         
-        # 状态映射
-        status_map = {
-            "活跃": "active",
-            "禁用": "disabled", 
-            "待审核": "pending"
-        }
-        
-        filter_status = status_map.get(filter_text)
+        filter_status = _STATUS_VALUE.get(filter_text)
         if not filter_status:
             return
         
         # 筛选用户
-        filtered_users = [u for u in self.users if u.status == filter_status]
-        
-        # 清空并重新加载
-        for item in self.user_tree.get_children():
-            self.user_tree.delete(item)
-        
-        for user in filtered_users:
-            self.user_tree.insert('', 'end', values=(
-                user.user_id, user.username, user.email, user.role,
-                self._get_status_text(user.status), user.department,
-                user.phone, user.created_at, user.last_login or "从未登录",
-                len(user.permissions)
-            ))
+        matches = {
+            iid for iid, user in zip(self._user_iids, self.users)
+            if user.status == filter_status
+        }
+        self._show_user_rows(matches)
+        # 筛选改变了显示的行，之后的搜索需要重新执行
+        self._last_search = None
+    
+    def destroy(self):
+        """销毁界面并取消未执行的搜索"""
+        if self._search_after_id:
+            self.user_tree.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        super().destroy()
     
     def create_user(self):
         """创建用户"""
@@ -1509,7 +1682,7 @@ class UserManagementGUI(BaseFrame):
             try:
                 # 创建新用户
                 new_user = User(
-                    user_id=len(self.users) + 1,
+                    user_id=max((u.user_id for u in self.users), default=0) + 1,
                     username=result['username'],
                     email=result['email'],
                     role=result['role'],
@@ -1546,6 +1719,7 @@ class UserManagementGUI(BaseFrame):
                 self.current_user.phone = result['phone']
                 self.current_user.department = result['department']
                 
+                self._invalidate_row(self.current_user)
                 self.load_users()
                 messagebox.showinfo("成功", f"用户 {self.current_user.username} 更新成功")
                 
@@ -1578,73 +1752,87 @@ class UserManagementGUI(BaseFrame):
             messagebox.showwarning("警告", "请先选择要管理的用户")
             return
         
-        # 状态管理对话框
-        status_window = tk.Toplevel(self.widget)
-        status_window.title(f"状态管理 - {self.current_user.username}")
+        # 状态管理对话框只创建一次，之后隐藏/显示复用
+        if self._status_window is None or not self._status_window.winfo_exists():
+            self._create_status_window()
+        
+        user = self.current_user
+        status_window = self._status_window
+        status_window.title(f"状态管理 - {user.username}")
+        self._status_user_label.config(text=f"用户: {user.username}\n邮箱: {user.email}")
+        self._status_current_label.config(text=self._get_status_text(user.status))
+        self._status_var.set(user.status)
+        
+        status_window.deiconify()
+        status_window.grab_set()
+    
+    def _create_status_window(self):
+        """创建状态管理对话框（初始隐藏）"""
+        status_window = self._status_window = tk.Toplevel(self.widget)
+        status_window.withdraw()
         status_window.geometry("400x300")
         status_window.resizable(False, False)
         status_window.transient(self.widget)
-        status_window.grab_set()
+        status_window.protocol("WM_DELETE_WINDOW", self._hide_status_window)
         
         # 状态管理界面
         main_frame = ttk.Frame(status_window, padding="20")
         main_frame.pack(fill='both', expand=True)
         
         # 用户信息
-        user_info = ttk.Label(
-            main_frame, 
-            text=f"用户: {self.current_user.username}\n邮箱: {self.current_user.email}",
-            font=('Segoe UI', 10)
-        )
-        user_info.pack(pady=(0, 20))
+        self._status_user_label = ttk.Label(main_frame, font=('Segoe UI', 10))
+        self._status_user_label.pack(pady=(0, 20))
         
         # 当前状态
         ttk.Label(main_frame, text="当前状态:", font=('Segoe UI', 10, 'bold')).pack(anchor='w')
-        current_status_label = ttk.Label(
-            main_frame, 
-            text=self._get_status_text(self.current_user.status),
-            font=('Segoe UI', 12)
-        )
-        current_status_label.pack(anchor='w', pady=(5, 15))
+        self._status_current_label = ttk.Label(main_frame, font=('Segoe UI', 12))
+        self._status_current_label.pack(anchor='w', pady=(5, 15))
         
         # 新状态选择
         ttk.Label(main_frame, text="更改为:", font=('Segoe UI', 10, 'bold')).pack(anchor='w')
         
-        status_var = tk.StringVar(value=self.current_user.status)
+        self._status_var = tk.StringVar(master=status_window)
         status_frame = ttk.Frame(main_frame)
         status_frame.pack(fill='x', pady=(5, 20))
         
-        statuses = [("活跃", "active"), ("禁用", "disabled"), ("待审核", "pending")]
-        for text, value in statuses:
-            rb = ttk.Radiobutton(status_frame, text=text, variable=status_var, value=value)
+        for text, value in _STATUS_CHOICES:
+            rb = ttk.Radiobutton(status_frame, text=text, variable=self._status_var, value=value)
             rb.pack(anchor='w', pady=2)
         
         # 操作按钮
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill='x')
         
-        def update_status():
-            new_status = status_var.get()
-            if new_status != self.current_user.status:
-                self.current_user.status = new_status
-                self.load_users()
-                messagebox.showinfo("成功", "用户状态已更新")
-            status_window.destroy()
-        
-        def reset_password():
-            if messagebox.askyesno("确认", "确定要重置此用户的密码吗？"):
-                messagebox.showinfo("提示", "密码重置邮件已发送")
-                status_window.destroy()
-        
-        update_btn = ttk.Button(button_frame, text="更新状态", command=update_status, style='Accent.TButton')
+        update_btn = ttk.Button(button_frame, text="更新状态", command=self._update_user_status, style='Accent.TButton')
         update_btn.pack(side='right', padx=(10, 0))
         
-        reset_btn = ttk.Button(button_frame, text="重置密码", command=reset_password)
+        reset_btn = ttk.Button(button_frame, text="重置密码", command=self._reset_user_password)
         reset_btn.pack(side='right')
         
-        cancel_btn = ttk.Button(button_frame, text="取消", command=status_window.destroy)
+        cancel_btn = ttk.Button(button_frame, text="取消", command=self._hide_status_window)
         cancel_btn.pack(side='right', padx=(0, 10))
     
+    def _hide_status_window(self):
+        """隐藏状态管理对话框（保留以便下次复用）"""
+        self._status_window.grab_release()
+        self._status_window.withdraw()
+    
+    def _update_user_status(self):
+        """应用状态管理对话框中选择的状态"""
+        new_status = self._status_var.get()
+        if new_status != self.current_user.status:
+            self.current_user.status = new_status
+            self._invalidate_row(self.current_user)
+            self.load_users()
+            messagebox.showinfo("成功", "用户状态已更新")
+        self._hide_status_window()
+    
+    def _reset_user_password(self):
+        """重置当前用户密码"""
+        if messagebox.askyesno("确认", "确定要重置此用户的密码吗？"):
+            messagebox.showinfo("提示", "密码重置邮件已发送")
+            self._hide_status_window()
+    
     def manage_permissions(self):
         """管理权限"""
         if not self.current_user:
@@ -1657,6 +1845,7 @@ class UserManagementGUI(BaseFrame):
         if result is not None:
             try:
                 self.current_user.permissions = result
+                self._invalidate_row(self.current_user)
                 self.load_users()
                 messagebox.showinfo("成功", f"用户 {self.current_user.username} 权限已更新")
                 
@@ -1697,8 +1886,10 @@ class UserManagementGUI(BaseFrame):
     
     def refresh_data(self):
         """刷新数据"""
+        self._row_cache.clear()
         self.load_users()
-        self.load_activity_logs()
+        if self.log_tree is not None:  # 活动日志页尚未打开时无需刷新
+            self.load_activity_logs()
         self.info_label.config(text="数据已刷新")
         self.search_var.set("")
         self.filter_var.set("全部")
@@ -1710,7 +1901,8 @@ def create_user_management_window():
     root.title("用户管理系统 - Sister's Flower System")
     root.geometry("1200x800")
     
-    # 应用Win11主题
+    # 应用Win11主题（仅独立运行窗口时需要，延迟导入）
+    from ..config.win11_theme import win11_theme
     win11_theme.apply_theme(root)
     
     # 创建用户管理界面
@@ -6,6 +6,7 @@
 from typing import List, Optional, Dict, Any
 
 from ..database.repositories import InventoryRepository
+from ..utils.event_bus import event_bus
 from ..models import Inventory, ModelConverter
 
 
@@ -34,7 +35,10 @@ class InventoryService:
             
             # 保存到数据库
             item_id = self.repository.create_item(item)
-            return item_id > 0
+            if item_id > 0:
+                event_bus.publish('inventory_changed')
+                return True
+            return False
             
         except Exception as e:
             print(f"创建商品失败: {e}")
@@ -92,7 +96,10 @@ class InventoryService:
             if remark is not None:
                 item.remark = remark
             
-            return self.repository.update_item(item.item_id, item) > 0
+            if self.repository.update_item(item.item_id, item) > 0:
+                event_bus.publish('inventory_changed')
+                return True
+            return False
             
         except Exception as e:
             print(f"更新商品失败: {e}")
@@ -120,6 +127,7 @@ class InventoryService:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM inventory WHERE item_id = ?", (item.item_id,))
             conn.commit()
+            event_bus.publish('inventory_changed')
             return True
             
         except Exception as e:
@@ -9,6 +9,7 @@ from typing import List, Optional, Dict, Any
 
 from ..config.settings import DB_PATH
 from ..database.repositories import MemberRepository
+from ..utils.event_bus import event_bus
 from ..models import Member
 
 
@@ -36,7 +37,10 @@ class MemberService:
             
             # 保存到数据库
             member_id = self.repository.create_member(member)
-            return member_id > 0
+            if member_id > 0:
+                event_bus.publish('customers_changed')
+                return True
+            return False
             
         except Exception as e:
             print(f"创建会员失败: {e}")
@@ -186,6 +190,7 @@ class MemberService:
             
             conn.commit()
             conn.close()
+            event_bus.publish('customers_changed')
             return True
             
         except Exception as e:
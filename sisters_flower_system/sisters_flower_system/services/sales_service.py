@@ -7,6 +7,7 @@ from datetime import datetime, date
 from typing import List, Optional, Dict, Any
 
 from ..database.repositories import SalesRepository, SaleItemRepository
+from ..utils.event_bus import event_bus
 from ..models import Sale, SaleItem
 from ..services.member_service import MemberService
 
@@ -53,6 +54,7 @@ class SalesService:
             if is_member and member_phone:
                 self.member_service.deduct_balance(member_phone, total_paid)
             
+            event_bus.publish('sales_changed')
             return sale_id
             
         except Exception as e:
@@ -187,6 +189,7 @@ class SalesService:
             conn.commit()
             conn.close()
             
+            event_bus.publish('sales_changed')
             return True
             
         except Exception as e:
@@ -1,50 +1,46 @@
 """
 工具函数模块
 提供项目中使用的各种工具函数
+
+子模块按需导入：gui_utils、image_utils、notification_utils 依赖界面库，
+业务服务只导入 event_bus 等子模块时不会加载 tkinter
 """
 
-from .gui_utils import (
-    configure_scaling_and_font,
-    make_table,
-    button_animation,
-    show_temp_message,
-    scale_image_to_fit,
-    safe_open_image
-)
-from .image_utils import (
-    AvatarCropper
-)
-from .notification_utils import (
-    WindowsNotification
-)
-from .path_utils import (
-    get_resource_path,
-    get_project_root,
-    get_database_path,
-    ensure_directory,
-    get_config_path
-)
-from .system_utils import (
-    get_version_from_filename,
-    SingleInstance,
-    check_festival
-)
-
-__all__ = [
-    'configure_scaling_and_font',
-    'make_table',
-    'button_animation',
-    'show_temp_message',
-    'scale_image_to_fit',
-    'safe_open_image',
-    'get_version_from_filename',
-    'SingleInstance',
-    'check_festival',
-    'get_resource_path',
-    'get_project_root',
-    'get_database_path',
-    'ensure_directory',
-    'get_config_path',
-    'AvatarCropper',
-    'WindowsNotification'
-]
\ No newline at end of file
+from importlib import import_module
+
+# 导出名称 -> 所在子模块
+_EXPORTS = {
+    'configure_scaling_and_font': 'gui_utils',
+    'make_table': 'gui_utils',
+    'button_animation': 'gui_utils',
+    'show_temp_message': 'gui_utils',
+    'scale_image_to_fit': 'gui_utils',
+    'safe_open_image': 'gui_utils',
+    'get_version_from_filename': 'system_utils',
+    'SingleInstance': 'system_utils',
+    'check_festival': 'system_utils',
+    'get_resource_path': 'path_utils',
+    'get_project_root': 'path_utils',
+    'get_database_path': 'path_utils',
+    'ensure_directory': 'path_utils',
+    'get_config_path': 'path_utils',
+    'AvatarCropper': 'image_utils',
+    'WindowsNotification': 'notification_utils',
+    'EventBus': 'event_bus',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """首次访问导出名称时再导入对应子模块"""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
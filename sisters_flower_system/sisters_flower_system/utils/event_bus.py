@@ -0,0 +1,35 @@
+"""
+事件总线
+不依赖界面库的发布/订阅机制，供业务服务发布数据变更、界面订阅刷新
+"""
+
+from typing import Callable, Dict, List
+
+
+class EventBus:
+    """轻量级发布/订阅事件总线，用于在数据写入时通知界面刷新"""
+    
+    def __init__(self):
+        self._subscribers: Dict[str, List[Callable]] = {}
+    
+    def subscribe(self, topic: str, callback: Callable):
+        """订阅主题"""
+        self._subscribers.setdefault(topic, []).append(callback)
+    
+    def unsubscribe(self, topic: str, callback: Callable):
+        """取消订阅"""
+        callbacks = self._subscribers.get(topic)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+    
+    def publish(self, topic: str, *args, **kwargs):
+        """发布主题，依次通知所有订阅者"""
+        for callback in list(self._subscribers.get(topic, ())):
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"事件处理失败 {topic}: {e}")
+
+
+# 全局事件总线
+event_bus = EventBus()